@@ -42,9 +42,20 @@ from .storage import EvalStorage
 __version__ = "0.1.0"
 __author__ = "Animal Ethics Evaluation Team"
 
+def __getattr__(name: str):
+    """Resolve provider integrations on first access (their SDKs load only when constructed)"""
+    if name in ("ClaudeLLM", "OpenAILLM"):
+        from . import llm_interface
+        return getattr(llm_interface, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 # Quick setup functions for common use cases
 def create_basic_evaluator() -> EvalRunner:
-    """Factory function for quick setup with mock LLM"""
+    """Factory function for quick setup with mock LLM
+    
+    The mock answers instantly. To simulate API latency (e.g. for demos), use
+    create_evaluator(MockLLM(config={"simulate_latency": True})) instead.
+    """
     hierarchy = AnimalHierarchy()
     probes = ProbeLibrary()
     llm = MockLLM("mock-model-v1")
@@ -137,8 +148,7 @@ def print_hierarchy_analysis(eval_run: EvalRun, hierarchy: AnimalHierarchy = Non
     
     # Print top EDM scores
     print(f"\nLargest Ethical Distances:")
-    sorted_edm = sorted(eval_run.edm_scores.items(), key=lambda x: x[1], reverse=True)
-    for (animal_a, animal_b), edm in sorted_edm[:10]:
+    for (animal_a, animal_b), edm in eval_run.top_edm_pairs(10):
         print(f"  {animal_a} vs {animal_b}: {edm:.3f}")
 
 # Export commonly used classes and functions
@@ -146,6 +156,7 @@ __all__ = [
     # Core classes
     "Animal", "Probe", "Response", "EvalRun",
     "AnimalHierarchy", "ProbeLibrary", "LLMInterface", "MockLLM",
+    "ClaudeLLM", "OpenAILLM",
     "ResponseScorer", "EvalRunner", "EvalStorage",
     
     # Factory functions
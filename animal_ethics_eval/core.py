@@ -9,12 +9,16 @@ These foundational classes represent the key entities in our evaluation system:
 """
 
 from dataclasses import dataclass, field
-from typing import List, Dict, Tuple, Optional, Any
+from typing import List, Dict, Tuple, Optional, Any, Callable, Mapping
 from datetime import datetime
-from pathlib import Path
-import json
+import heapq
+import string
+import time
+from operator import itemgetter
 
-@dataclass
+import numpy as np
+
+@dataclass(slots=True)
 class Animal:
     """Core animal representation with hierarchy position"""
     name: str
@@ -30,35 +34,63 @@ class Animal:
     def __str__(self) -> str:
         return f"{self.name} ({self.category}, level {self.hierarchy_level})"
 
-@dataclass
+@dataclass(slots=True)
 class Probe:
     """Ethics question template with variables"""
     id: str
     template: str  # "Is it wrong to harm {animal}?"
     probe_type: str  # "moral_consideration", "harm_threshold", etc.
     variables: List[str] = field(default_factory=list)
+    _render: Callable[[Mapping[str, Any]], str] = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        """Infer variables when not given (each field once, in template order)"""
+        if not self.variables:
+            self.variables = list(dict.fromkeys(name for _, name, _, _ in _parse_template(self.template) if name))
+    
+    def __setattr__(self, name: str, value: Any) -> None:
+        """Recompile the render function whenever the template is (re)assigned"""
+        object.__setattr__(self, name, value)
+        if name == "template":
+            object.__setattr__(self, "_render", _compile_template(value))
+    
+    def __getstate__(self) -> Tuple[str, str, str, List[str]]:
+        """Pickle without the generated render function (it is rebuilt on load)"""
+        return (self.id, self.template, self.probe_type, self.variables)
+    
+    def __setstate__(self, state: Tuple[str, str, str, List[str]]) -> None:
+        self.id, self.template, self.probe_type, self.variables = state
     
     def generate_prompt(self, **kwargs) -> str:
         """Fill template with provided variables"""
-        return self.template.format(**kwargs)
+        return self._render(kwargs)
+    
+    def render(self, variables: Mapping[str, Any]) -> str:
+        """Fill template from a variables mapping (no keyword unpacking)"""
+        return self._render(variables)
     
     def __str__(self) -> str:
         return f"Probe({self.id}: {self.template})"
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Response:
-    """LLM response to a probe about a specific animal"""
+    """LLM response to a probe about a specific animal (immutable once created)"""
     probe_id: str
     animal: str
     response_text: str
     model_id: str
-    timestamp: datetime = field(default_factory=datetime.now)
+    timestamp_ns: int = field(default_factory=time.time_ns)  # Epoch nanoseconds, rendered on demand
     config: Dict[str, Any] = field(default_factory=dict)
     
+    @property
+    def timestamp(self) -> datetime:
+        """Creation time as a local datetime"""
+        return datetime.fromtimestamp(self.timestamp_ns / 1e9)
+    
     def __str__(self) -> str:
         return f"Response({self.probe_id}, {self.animal}, {self.model_id})"
 
-@dataclass
+@dataclass(slots=True)
 class EvalRun:
     """Complete evaluation run with all responses and computed metrics"""
     run_id: str
@@ -68,14 +100,110 @@ class EvalRun:
     edm_scores: Dict[Tuple[str, str], float] = field(default_factory=dict)
     summary_metrics: Dict[str, float] = field(default_factory=dict)
     metadata: Dict[str, Any] = field(default_factory=dict)
+    _edm_matrix: Optional[np.ndarray] = field(default=None, init=False, repr=False, compare=False)
+    _animal_index: Dict[str, int] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _edm_indexed: Tuple[int, int] = field(default=(0, -1), init=False, repr=False, compare=False)  # (id, len) of edm_scores
+    _by_animal: Dict[str, List[Response]] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _by_probe: Dict[str, List[Response]] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _indexed: Tuple[int, int] = field(default=(0, -1), init=False, repr=False, compare=False)  # (id, len) of indexed list
     
     def __str__(self) -> str:
         return f"EvalRun({self.run_id}, {self.model_id}, {len(self.responses)} responses)"
     
+    @property
+    def edm_matrix(self) -> np.ndarray:
+        """Symmetric (N, N) EDM matrix derived from edm_scores, NaN for unscored pairs"""
+        self._ensure_edm_matrix()
+        return self._edm_matrix
+    
+    @property
+    def animal_index(self) -> Dict[str, int]:
+        """Animal name -> edm_matrix row"""
+        self._ensure_edm_matrix()
+        return self._animal_index
+    
+    def _ensure_edm_matrix(self) -> None:
+        """(Re)build the EDM matrix if edm_scores was replaced or resized"""
+        if self._edm_matrix is not None and self._edm_indexed == (id(self.edm_scores), len(self.edm_scores)):
+            return
+        self._animal_index, self._edm_matrix = edm_scores_to_matrix(self.edm_scores)
+        self._edm_indexed = (id(self.edm_scores), len(self.edm_scores))
+    
+    def top_edm_pairs(self, k: int = 10) -> List[Tuple[Tuple[str, str], float]]:
+        """Get the k largest EDM scores
+        
+        Pairs come back keyed exactly as in edm_scores; unscored (NaN) pairs are skipped.
+        """
+        # O(n log k) heap selection; ties keep their edm_scores order, exactly like sorted(...)[:k]
+        scored = ((pair, edm) for pair, edm in self.edm_scores.items() if edm == edm)  # NaN != NaN
+        return heapq.nlargest(k, scored, key=itemgetter(1))
+    
     def get_responses_for_animal(self, animal_name: str) -> List[Response]:
         """Get all responses about a specific animal"""
-        return [r for r in self.responses if r.animal == animal_name]
+        self._ensure_indexed()
+        return self._by_animal.get(animal_name, [])
     
     def get_responses_for_probe(self, probe_id: str) -> List[Response]:
         """Get all responses to a specific probe"""
-        return [r for r in self.responses if r.probe_id == probe_id] 
\ No newline at end of file
+        self._ensure_indexed()
+        return self._by_probe.get(probe_id, [])
+    
+    def _ensure_indexed(self) -> None:
+        """(Re)build the animal/probe indices if responses was replaced or resized"""
+        if self._indexed == (id(self.responses), len(self.responses)):
+            return
+        
+        self._by_animal, self._by_probe = {}, {}
+        for r in self.responses:
+            self._by_animal.setdefault(r.animal, []).append(r)
+            self._by_probe.setdefault(r.probe_id, []).append(r)
+        self._indexed = (id(self.responses), len(self.responses))
+
+
+def _parse_template(template: str) -> List[Tuple[str, Optional[str], Optional[str], Optional[str]]]:
+    """Split a str.format template into (literal, field, spec, conversion) parts ([] if malformed)"""
+    try:
+        return list(string.Formatter().parse(template))
+    except ValueError:
+        return []
+
+def _compile_template(template: str) -> Callable[[Mapping[str, Any]], str]:
+    """Compile a {name}-style template into a function of a variables mapping
+    
+    Plain {name} fields become one f-string expression, so rendering skips
+    str.format's per-call parsing. Only repr'd literals and v[name] lookups are
+    generated; templates with conversions, format specs, indexed fields or
+    malformed braces fall back to str.format_map.
+    """
+    parts = _parse_template(template)
+    if not parts:
+        return template.format_map
+    
+    pieces = []
+    for literal, name, spec, conversion in parts:
+        if literal:
+            pieces.append(repr(literal))
+        if name is None:
+            continue
+        if not name.isidentifier() or spec or conversion:
+            return template.format_map
+        pieces.append(f'f"{{v[{name!r}]}}"')
+    
+    namespace: Dict[str, Any] = {}
+    exec(f"def _render(v):\n    return {' '.join(pieces)}", namespace)
+    return namespace["_render"]
+
+def edm_scores_to_matrix(edm_scores: Dict[Tuple[str, str], float]) -> Tuple[Dict[str, int], np.ndarray]:
+    """Flatten pairwise EDM scores into an animal index and a symmetric matrix"""
+    animal_index: Dict[str, int] = {}
+    for animal_a, animal_b in edm_scores:
+        animal_index.setdefault(animal_a, len(animal_index))
+        animal_index.setdefault(animal_b, len(animal_index))
+    
+    matrix = np.full((len(animal_index), len(animal_index)), np.nan)
+    np.fill_diagonal(matrix, 0.0)
+    for (animal_a, animal_b), edm in edm_scores.items():
+        i, j = animal_index[animal_a], animal_index[animal_b]
+        matrix[i, j] = matrix[j, i] = edm
+    
+    return animal_index, matrix
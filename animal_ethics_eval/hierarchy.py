@@ -11,10 +11,11 @@ This module can evolve to handle:
 """
 
 from typing import List, Tuple, Optional, Dict
+from itertools import combinations
 from pathlib import Path
-import json
 
 from .core import Animal
+from . import serialization
 
 class AnimalHierarchy:
     """Manages the animal taxonomy and comparison relationships"""
@@ -22,12 +23,21 @@ class AnimalHierarchy:
     def __init__(self, config_path: Optional[Path] = None):
         """Initialize with default or custom hierarchy"""
         self.animals = self._load_hierarchy(config_path)
-        self._category_lookup = {a.name.lower(): a for a in self.animals}
+        self._by_name = {a.name.lower(): a for a in self.animals}
+        self._by_category = {}
         self._level_lookup = {a.hierarchy_level: [] for a in self.animals}
         
-        # Group animals by level for easy access
+        # Group animals by category (lowercased) and level for easy access
         for animal in self.animals:
+            self._by_category.setdefault(animal.category.lower(), []).append(animal)
             self._level_lookup[animal.hierarchy_level].append(animal)
+        
+        # Precompute hierarchy distances for every (ordered) pair of names
+        self._dist_cache = {
+            (a.name.lower(), b.name.lower()): abs(a.hierarchy_level - b.hierarchy_level)
+            for a in self.animals
+            for b in self.animals
+        }
     
     def _load_hierarchy(self, config_path: Optional[Path]) -> List[Animal]:
         """Load animal hierarchy - start with foundational 9 levels"""
@@ -49,8 +59,7 @@ class AnimalHierarchy:
     
     def _load_from_config(self, config_path: Path) -> List[Animal]:
         """Load hierarchy from JSON config file"""
-        with open(config_path) as f:
-            data = json.load(f)
+        data = serialization.loads(Path(config_path).read_bytes())
         
         animals = []
         for item in data.get("animals", []):
@@ -66,7 +75,7 @@ class AnimalHierarchy:
     
     def get_animals_by_category(self, category: str) -> List[Animal]:
         """Get all animals in a specific category"""
-        return [a for a in self.animals if a.category.lower() == category.lower()]
+        return self._by_category.get(category.lower(), [])
     
     def get_animals_by_level(self, level: int) -> List[Animal]:
         """Get all animals at a specific hierarchy level"""
@@ -74,33 +83,29 @@ class AnimalHierarchy:
     
     def get_comparison_pairs(self, include_adjacent_only: bool = False) -> List[Tuple[Animal, Animal]]:
         """Generate meaningful animal pairs for EDM calculation"""
+        if not include_adjacent_only:
+            # Upper triangle only - no duplicates or self-comparisons
+            return list(combinations(self.animals, 2))
+        
+        # Animals are sorted by level, so in list order each animal's partners are its
+        # later same-level peers followed by the level directly above
         pairs = []
-        for i, animal_a in enumerate(self.animals):
-            for j, animal_b in enumerate(self.animals):
-                if i < j:  # Avoid duplicates and self-comparisons
-                    level_diff = abs(animal_a.hierarchy_level - animal_b.hierarchy_level)
-                    
-                    if include_adjacent_only:
-                        if level_diff <= 1:
-                            pairs.append((animal_a, animal_b))
-                    else:
-                        pairs.append((animal_a, animal_b))
+        for level in sorted(self._level_lookup):
+            same_level = self._level_lookup[level]
+            next_level = self._level_lookup.get(level + 1, [])
+            for i, animal_a in enumerate(same_level):
+                pairs.extend((animal_a, animal_b) for animal_b in same_level[i + 1:])
+                pairs.extend((animal_a, animal_b) for animal_b in next_level)
         
         return pairs
     
     def get_animal(self, name: str) -> Optional[Animal]:
         """Get animal by name (case-insensitive)"""
-        return self._category_lookup.get(name.lower())
+        return self._by_name.get(name.lower())
     
     def get_hierarchy_distance(self, animal_a: str, animal_b: str) -> int:
-        """Calculate hierarchy distance between two animals"""
-        a = self.get_animal(animal_a)
-        b = self.get_animal(animal_b)
-        
-        if not a or not b:
-            return -1  # Invalid comparison
-        
-        return abs(a.hierarchy_level - b.hierarchy_level)
+        """Calculate hierarchy distance between two animals (-1 if either is unknown)"""
+        return self._dist_cache.get((animal_a.lower(), animal_b.lower()), -1)
     
     def get_level_range(self, min_level: int = 1, max_level: int = 9) -> List[Animal]:
         """Get animals within a specific level range"""
@@ -122,8 +127,7 @@ class AnimalHierarchy:
         }
         
         config_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(config_path, 'w') as f:
-            json.dump(config_data, f, indent=2)
+        config_path.write_bytes(serialization.dumps(config_data, indent=True))
     
     def __len__(self) -> int:
         return len(self.animals)
@@ -11,11 +11,11 @@ Current implementations:
 
 Each interface handles:
 - Model-specific API calls
-- Rate limiting and error handling
+- Rate limiting and error handling (pooled connections, retries with backoff)
 - Response formatting
 - Standardized configuration management (temperature, max_tokens, top_p, etc.)
 - System prompt support (both per-call and persistent)
-- Parameter validation and normalization
+- Parameter validation and normalization (config is read-only once validated)
 
 Standardized Parameters:
 - temperature: Controls randomness (0.0-2.0, clamped)
@@ -25,6 +25,8 @@ Standardized Parameters:
 - frequency_penalty: Reduces repetition (-2.0 to 2.0, OpenAI-specific)
 - presence_penalty: Encourages new topics (-2.0 to 2.0, OpenAI-specific)
 - system_prompt: Optional system/instruction prompt
+- concurrency: Maximum in-flight requests during batch_query
+- cache_responses: Reuse answers to identical prompts in batch_query (default: only at temperature 0)
 
 Usage:
     # Initialize with custom config
@@ -39,24 +41,70 @@ Usage:
     
     # Set persistent system prompt
     llm.set_system_prompt("You are an expert in ethics.")
+    
+    # Query many prompts concurrently (bounded by config["concurrency"])
+    responses = llm.batch_query(["Hello!", "Goodbye!"])
+    
+    # Pack 4 prompts into each request, one numbered answer per prompt
+    responses = llm.batch_query_marshaled(prompts, k=4)
+    
+    # Submit through the provider's batch API and wait for the results
+    responses = llm.batch_query(prompts, offline=True)
+    
+    # Release the event loop and worker threads (or use the LLM as a context manager)
+    llm.close()
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Hashable, Tuple
+from collections import defaultdict, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import hashlib
 import time
 import random
+import re
+import types
+
+from . import serialization
+
+# Shared by every marshaled request so providers can cache the system prompt
+MARSHAL_INSTRUCTIONS = (
+    "You will receive numbered questions. Answer each question on its own line. "
+    "Reply with exactly one line per question, starting with the question's number "
+    "followed by ')', for example '1) ...'."
+)
+
+# HTTP settings for provider clients: one keep-alive pool per client, SDK retries with backoff on 429/5xx
+HTTP_MAX_CONNECTIONS = 64
+HTTP_MAX_KEEPALIVE = 32
+HTTP_TIMEOUT = 60.0
+MAX_RETRIES = 5
+
+# Seconds between status checks while a provider batch job runs
+BATCH_POLL_INTERVAL = 30.0
+
+# Most answers batch_query keeps for reuse; least recently used ones are dropped first
+RESPONSE_CACHE_SIZE = 10_000
+
+# Splits a marshaled reply on its "1)" / "1." line prefixes
+_NUMBERED_LINE = re.compile(r"^\d+[\).]\s*", re.M)
 
 class LLMInterface(ABC):
     """Abstract base for different LLM providers"""
     
     def __init__(self, model_id: str, config: Optional[Dict[str, Any]] = None):
         self.model_id = model_id
-        self.config = config or self._default_config()
         self.call_count = 0
         self.total_time = 0.0
+        self.cache_hits = 0
+        self.prompts_requested = 0  # Prompts asked for through batch_query(_marshaled), however they were answered
+        self._cache: "OrderedDict[str, str]" = OrderedDict()  # LRU, at most RESPONSE_CACHE_SIZE answers
+        self._runner: Optional[asyncio.Runner] = None
+        self._loop_thread: Optional[ThreadPoolExecutor] = None  # Drives _runner when called from inside an event loop
         
-        # Validate and normalize config
-        self._normalize_config()
+        # Validate and normalize config once; read-only afterwards
+        self._set_config(config or self._default_config())
     
     def _default_config(self) -> Dict[str, Any]:
         """Default configuration for reproducible testing"""
@@ -68,22 +116,41 @@ class LLMInterface(ABC):
             "frequency_penalty": 0.0,  # OpenAI-specific
             "presence_penalty": 0.0,   # OpenAI-specific
             "system_prompt": None,     # Optional system prompt
+            "concurrency": 16,         # Max in-flight requests in batch_query
+            "cache_responses": None,   # Reuse identical batch_query answers (None = only at temperature 0)
         }
     
-    def _normalize_config(self):
-        """Ensure config values are within valid ranges"""
+    @classmethod
+    def _validate_config(cls, config: Dict[str, Any]) -> Dict[str, Any]:
+        """Return a copy of config with values clamped to valid ranges"""
+        cfg = dict(config)
+        
         # Clamp temperature between 0 and 2
-        self.config["temperature"] = max(0.0, min(2.0, self.config.get("temperature", 0.1)))
+        cfg["temperature"] = max(0.0, min(2.0, cfg.get("temperature", 0.1)))
         
         # Clamp top_p between 0 and 1
-        self.config["top_p"] = max(0.0, min(1.0, self.config.get("top_p", 0.9)))
+        cfg["top_p"] = max(0.0, min(1.0, cfg.get("top_p", 0.9)))
         
         # Ensure max_tokens is positive
-        self.config["max_tokens"] = max(1, self.config.get("max_tokens", 500))
+        cfg["max_tokens"] = max(1, cfg.get("max_tokens", 500))
         
         # Clamp penalty values between -2 and 2 (OpenAI range)
-        self.config["frequency_penalty"] = max(-2.0, min(2.0, self.config.get("frequency_penalty", 0.0)))
-        self.config["presence_penalty"] = max(-2.0, min(2.0, self.config.get("presence_penalty", 0.0)))
+        cfg["frequency_penalty"] = max(-2.0, min(2.0, cfg.get("frequency_penalty", 0.0)))
+        cfg["presence_penalty"] = max(-2.0, min(2.0, cfg.get("presence_penalty", 0.0)))
+        
+        # Ensure at least one request can be in flight
+        cfg["concurrency"] = max(1, int(cfg.get("concurrency", 16)))
+        
+        return cfg
+    
+    def _set_config(self, config: Dict[str, Any]):
+        """Validate config, freeze it, and precompute the per-call API parameters"""
+        self.config = types.MappingProxyType(self._validate_config(config))
+        self._api_params_base = self._base_params()
+    
+    def _base_params(self) -> Dict[str, Any]:
+        """Provider API parameters that are the same for every call"""
+        return {}
     
     @abstractmethod
     def query(self, prompt: str, system_prompt: Optional[str] = None) -> str:
@@ -95,30 +162,270 @@ class LLMInterface(ABC):
         """
         pass
     
-    def batch_query(self, prompts: list[str], system_prompt: Optional[str] = None) -> list[str]:
-        """Send multiple prompts (default: sequential)"""
+    async def aquery(self, prompt: str, system_prompt: Optional[str] = None) -> str:
+        """Async variant of query (default: run the sync query in a worker thread)"""
+        return await asyncio.to_thread(self.query, prompt, system_prompt)
+    
+    def batch_query(self, prompts: list[str], system_prompt: Optional[str] = None,
+                    return_exceptions: bool = False, offline: bool = False) -> list:
+        """Send multiple prompts concurrently, returning responses in input order
+        
+        With response caching on, prompts answered before (same model, system
+        prompt and generation config) are served from the cache and repeated
+        prompts within the batch are sent only once. The cache keeps the
+        RESPONSE_CACHE_SIZE most recently used answers.
+        
+        With return_exceptions, a failed prompt yields its exception in place of
+        a response instead of failing the whole batch (failures are not cached).
+        
+        With offline, prompts go out as one job through the provider's batch API
+        (cheaper, but results can take minutes to hours); providers without one
+        fall back to concurrent requests.
+        """
+        self.prompts_requested += len(prompts)
+        return self._batch_query(prompts, system_prompt, return_exceptions, offline)
+    
+    def _batch_query(self, prompts: list[str], system_prompt: Optional[str] = None,
+                     return_exceptions: bool = False, offline: bool = False) -> list:
+        """batch_query without counting the prompts as requested (for internal reuse)"""
+        dispatch = self._dispatch_offline if offline else self._dispatch_batch
+        
+        if not self._cache_enabled():
+            return dispatch(prompts, system_prompt, return_exceptions)
+        
+        keys = [self._cache_key(prompt, system_prompt) for prompt in prompts]
+        found, misses = {}, {}
+        for key, prompt in zip(keys, prompts):
+            if key in found or key in misses:
+                continue
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                found[key] = self._cache[key]
+            else:
+                misses[key] = prompt
+        
+        if misses:
+            answers = dispatch(list(misses.values()), system_prompt, return_exceptions)
+            for key, answer in zip(misses, answers):
+                found[key] = answer
+                if not isinstance(answer, BaseException):  # Failures are never cached
+                    self._cache[key] = answer
+            while len(self._cache) > RESPONSE_CACHE_SIZE:
+                self._cache.popitem(last=False)
+        
+        self.cache_hits += len(prompts) - len(misses)
+        return [found[key] for key in keys]
+    
+    def _dispatch_batch(self, prompts: list[str], system_prompt: Optional[str] = None,
+                        return_exceptions: bool = False) -> list:
+        """Send prompts to the model concurrently (no caching)"""
+        # Reuse one event loop per instance so async clients can keep their connections
+        if self._runner is None:
+            self._runner = asyncio.Runner()
+            # Sync-only providers run query in worker threads - give them one per in-flight request
+            self._runner.get_loop().set_default_executor(
+                ThreadPoolExecutor(max_workers=self.config["concurrency"], thread_name_prefix=self.model_id)
+            )
+        
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return self._runner.run(self._abatch(prompts, system_prompt, return_exceptions))
+        
+        # Called from async code (Jupyter, async apps): this thread's loop is busy, so
+        # drive our own loop from a dedicated worker thread and wait for it
+        if self._loop_thread is None:
+            self._loop_thread = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"{self.model_id}-loop")
+        return self._loop_thread.submit(
+            lambda: self._runner.run(self._abatch(prompts, system_prompt, return_exceptions))
+        ).result()
+    
+    def _dispatch_offline(self, prompts: list[str], system_prompt: Optional[str] = None,
+                          return_exceptions: bool = False) -> list:
+        """Send prompts as one provider batch job (default: no batch API, send concurrently)"""
+        return self._dispatch_batch(prompts, system_prompt, return_exceptions)
+    
+    @staticmethod
+    def _settle(results: list, return_exceptions: bool) -> list:
+        """Raise the first failure unless the caller asked for exceptions in place"""
+        if not return_exceptions:
+            for result in results:
+                if isinstance(result, BaseException):
+                    raise result
+        return results
+    
+    def _cache_enabled(self) -> bool:
+        """Whether batch_query may reuse cached answers"""
+        enabled = self.config.get("cache_responses")
+        if enabled is None:
+            # Only deterministic sampling makes repeated answers interchangeable
+            return self.config["temperature"] == 0
+        return bool(enabled)
+    
+    def _cache_key(self, prompt: str, system_prompt: Optional[str]) -> str:
+        """Stable key for a prompt under this model and generation config"""
+        active_system_prompt = system_prompt or self.config.get("system_prompt")
+        raw = f"{self.model_id}|{active_system_prompt}|{prompt}|{self._config_sig()}"
+        return hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()
+    
+    def _config_sig(self) -> str:
+        """Stable representation of the settings that affect a response"""
+        return repr(tuple(self.config.get(k) for k in
+                          ("temperature", "top_p", "top_k", "max_tokens", "frequency_penalty", "presence_penalty")))
+    
+    def batch_query_marshaled(self, prompts: list[str], k: int = 4,
+                              system_prompt: Optional[str] = None,
+                              keys: Optional[list[Hashable]] = None,
+                              return_exceptions: bool = False, offline: bool = False) -> list:
+        """Pack up to k prompts into each request and split the numbered reply
+        
+        Args:
+            prompts: User prompts, answered in input order
+            k: Maximum prompts per request (4 keeps per-request latency low)
+            system_prompt: Optional system prompt, prefixed to the marshaling instructions
+            keys: Optional per-prompt group keys; a request never mixes keys
+            return_exceptions: Put each failed prompt's exception in its place
+                instead of raising (a failed request fails every prompt packed into it)
+            offline: Send the packed requests through the provider's batch API
+        """
+        self.prompts_requested += len(prompts)
+        return self._settle(self._batch_query_marshaled(prompts, k, system_prompt, keys, offline), return_exceptions)
+    
+    def _batch_query_marshaled(self, prompts: list[str], k: int = 4,
+                               system_prompt: Optional[str] = None,
+                               keys: Optional[list[Hashable]] = None,
+                               offline: bool = False) -> list:
+        """batch_query_marshaled with failures always in place, not counting the prompts as requested"""
+        if self._cache_enabled():
+            # Pack each distinct question once and fan the answers back out
+            first = {}
+            for i, prompt in enumerate(prompts):
+                first.setdefault((keys[i] if keys is not None else None, prompt), i)
+            if len(first) < len(prompts):
+                unique = list(first)
+                answers = self._batch_query_marshaled([p for _, p in unique], k, system_prompt,
+                                                      [key for key, _ in unique] if keys is not None else None,
+                                                      offline)
+                by_prompt = dict(zip(unique, answers))
+                return [by_prompt[(keys[i] if keys is not None else None, prompt)] for i, prompt in enumerate(prompts)]
+        
+        # Chunk consecutive prompts, starting a new chunk when full or the key changes
+        chunks = []
+        for i, prompt in enumerate(prompts):
+            key = keys[i] if keys is not None else None
+            if not chunks or len(chunks[-1][1]) >= max(1, k) or chunks[-1][0] != key:
+                chunks.append((key, []))
+            chunks[-1][1].append(prompt)
+        
+        base_system_prompt = system_prompt or self.config.get("system_prompt")
+        marshal_system_prompt = (f"{base_system_prompt}\n\n{MARSHAL_INSTRUCTIONS}"
+                                 if base_system_prompt else MARSHAL_INSTRUCTIONS)
+        
+        combined = [
+            f"Answer each of the following {len(chunk)} questions:\n"
+            + "\n".join(f"{i + 1}) {p}" for i, p in enumerate(chunk))
+            for _, chunk in chunks
+        ]
+        replies = self._batch_query(combined, marshal_system_prompt, return_exceptions=True, offline=offline)
+        
         responses = []
-        for prompt in prompts:
-            responses.append(self.query(prompt, system_prompt))
+        retry = []  # Positions in responses whose chunk's reply was malformed
+        for (_, chunk), reply in zip(chunks, replies):
+            if isinstance(reply, BaseException):
+                responses.extend([reply] * len(chunk))
+                continue
+            answers = [a.strip() for a in _NUMBERED_LINE.split(reply)[1:]]
+            if len(answers) != len(chunk):
+                retry.extend(range(len(responses), len(responses) + len(chunk)))
+                answers = chunk  # Placeholders until the retry below answers them
+            responses.extend(answers)
+        
+        if retry:
+            # Malformed replies - send their prompts one per request, all in a single dispatch
+            answers = self._batch_query([responses[i] for i in retry], system_prompt,
+                                        return_exceptions=True, offline=offline)
+            for i, answer in zip(retry, answers):
+                responses[i] = answer
+        
         return responses
     
+    async def _abatch(self, prompts: list[str], system_prompt: Optional[str] = None,
+                      return_exceptions: bool = False) -> list:
+        """Gather aquery calls with at most config["concurrency"] in flight"""
+        sem = asyncio.Semaphore(self.config["concurrency"])
+        
+        async def one(prompt: str) -> str:
+            async with sem:
+                return await self.aquery(prompt, system_prompt)
+        
+        tasks = [asyncio.ensure_future(one(p)) for p in prompts]
+        try:
+            return list(await asyncio.gather(*tasks, return_exceptions=return_exceptions))
+        except BaseException:
+            # gather doesn't stop the siblings of a failed task - cancel them so no requests outlive the batch
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+    
+    def close(self):
+        """Shut down the event loop and worker threads; they are recreated if the instance is used again"""
+        runner, self._runner = self._runner, None
+        loop_thread, self._loop_thread = self._loop_thread, None
+        
+        if runner is not None:
+            # Closing also shuts down the loop's default executor
+            try:
+                asyncio.get_running_loop()
+            except RuntimeError:
+                runner.close()
+            else:
+                # Closing drives our loop, which can't happen on a thread already running one
+                with ThreadPoolExecutor(max_workers=1) as pool:
+                    pool.submit(runner.close).result()
+        
+        if loop_thread is not None:
+            loop_thread.shutdown()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
     def set_system_prompt(self, system_prompt: str):
         """Set persistent system prompt in config"""
-        self.config["system_prompt"] = system_prompt
+        self._set_config({**self.config, "system_prompt": system_prompt})
     
     def get_stats(self) -> Dict[str, Any]:
         """Get usage statistics"""
         return {
             "model_id": self.model_id,
             "call_count": self.call_count,
+            "cache_hits": self.cache_hits,
+            "prompts_requested": self.prompts_requested,
             "total_time": self.total_time,
             "avg_time_per_call": self.total_time / max(self.call_count, 1),
-            "config": self.config.copy()
+            "config": dict(self.config)
         }
 
 class MockLLM(LLMInterface):
     """Simple mock for testing and development"""
     
+    # Animals mentioned in a prompt determine the response tier (built once, hashed lookups)
+    _HIGH_ANIMALS = frozenset({"human", "person", "child", "dog", "cat", "chimpanzee", "gorilla"})
+    _MEDIUM_ANIMALS = frozenset({"cow", "whale", "mouse", "robin", "eagle", "chicken"})
+    _LOW_ANIMALS = frozenset({"ant", "mosquito", "snake", "frog", "salmon", "goldfish"})
+    _ALL_ANIMALS = _HIGH_ANIMALS | _MEDIUM_ANIMALS | _LOW_ANIMALS
+    _ANIMAL_TIERS = {**dict.fromkeys(_LOW_ANIMALS, 1),
+                     **dict.fromkeys(_MEDIUM_ANIMALS, 2),
+                     **dict.fromkeys(_HIGH_ANIMALS, 3)}
+    
+    # One compiled alternation finds every animal mention in a single pass (longest names first)
+    _ANIMAL_PATTERN = re.compile(
+        r"\b(" + "|".join(map(re.escape, sorted(_ALL_ANIMALS, key=lambda a: (-len(a), a)))) + r")\b"
+    )
+    
     def __init__(self, model_id: str = "mock-model-v1", config: Optional[Dict[str, Any]] = None):
         super().__init__(model_id, config)
         self.response_patterns = self._init_response_patterns()
@@ -163,90 +470,139 @@ class MockLLM(LLMInterface):
                 "They're relatively similar in moral consideration.",
                 "It would depend on the specific circumstances.",
                 "Both deserve consideration, though perhaps differently."
+            ],
+            
+            # Fallbacks when no known animals are mentioned
+            "neutral": [
+                "This is a complex ethical question that requires careful consideration of many factors."
+            ],
+            
+            "comparative_neutral": [
+                "Both animals deserve moral consideration in their own ways."
             ]
         }
     
+    def _default_config(self) -> Dict[str, Any]:
+        """Default configuration plus mock-only settings"""
+        return {
+            **super()._default_config(),
+            "simulate_latency": False,  # Sleep 0.1-0.3s per call like a real API (off for fast tests)
+        }
+    
     def query(self, prompt: str, system_prompt: Optional[str] = None) -> str:
         """Generate mock responses based on animal hierarchy and question type"""
         start_time = time.time()
         self.call_count += 1
         
-        # Add small delay to simulate API call
-        time.sleep(random.uniform(0.1, 0.3))
+        # Optionally add a small delay to simulate an API call
+        if self.config.get("simulate_latency", False):
+            time.sleep(random.uniform(0.1, 0.3))
+        
+        response = self._mock_response(prompt, system_prompt)
+        
+        self.total_time += time.time() - start_time
+        return response
+    
+    async def aquery(self, prompt: str, system_prompt: Optional[str] = None) -> str:
+        """Async mock query - the simulated delay yields so batches overlap"""
+        start_time = time.time()
+        self.call_count += 1
+        
+        if self.config.get("simulate_latency", False):
+            await asyncio.sleep(random.uniform(0.1, 0.3))
         
+        response = self._mock_response(prompt, system_prompt)
+        
+        self.total_time += time.time() - start_time
+        return response
+    
+    def _mock_response(self, prompt: str, system_prompt: Optional[str] = None) -> str:
+        """Pick a mock response for the prompt (no simulated latency)"""
         # Use provided system prompt or fall back to config
         active_system_prompt = system_prompt or self.config.get("system_prompt")
         
+        # Marshaled prompts get one numbered answer per question
+        questions = _NUMBERED_LINE.split(prompt)[1:]
+        if questions:
+            return "\n".join(f"{i + 1}) {self._mock_response(q.strip(), system_prompt)}"
+                             for i, q in enumerate(questions))
+        
         prompt_lower = prompt.lower()
         
         # If system prompt affects behavior, we could modify response here
         # For now, just generate standard mock responses
+        pool, variables = self._classify(prompt_lower)
+        response = random.choice(self.response_patterns[pool])
+        return response.format(**variables) if variables else response
+    
+    def _dispatch_batch(self, prompts: list[str], system_prompt: Optional[str] = None,
+                        return_exceptions: bool = False) -> list:
+        """Answer a batch of prompts, drawing each response pool's picks in one call"""
+        if self.config.get("simulate_latency", False):
+            return super()._dispatch_batch(prompts, system_prompt, return_exceptions)
+        
+        start_time = time.time()
+        self.call_count += len(prompts)
         
-        # Determine response type based on animals mentioned
-        high_animals = ["human", "person", "child", "dog", "cat", "chimpanzee", "gorilla"]
-        medium_animals = ["cow", "whale", "mouse", "robin", "eagle", "chicken"]
-        low_animals = ["ant", "mosquito", "snake", "frog", "salmon", "goldfish"]
+        responses = [None] * len(prompts)
+        by_pool = defaultdict(list)
+        for i, prompt in enumerate(prompts):
+            if _NUMBERED_LINE.search(prompt):
+                # Marshaled prompts are answered question by question
+                responses[i] = self._mock_response(prompt, system_prompt)
+            else:
+                pool, variables = self._classify(prompt.lower())
+                by_pool[pool].append((i, variables))
         
-        response = self._generate_contextual_response(prompt_lower, high_animals, medium_animals, low_animals)
+        # Sample every response for a pool at once, then scatter back into input order
+        for pool, items in by_pool.items():
+            picks = random.choices(self.response_patterns[pool], k=len(items))
+            for (i, variables), response in zip(items, picks):
+                responses[i] = response.format(**variables) if variables else response
         
         self.total_time += time.time() - start_time
-        return response
+        return responses
     
-    def _generate_contextual_response(self, prompt: str, high_animals: list, medium_animals: list, low_animals: list) -> str:
-        """Generate response based on context and animals mentioned"""
+    def _classify(self, prompt: str) -> Tuple[str, Dict[str, str]]:
+        """Pick the response pool (and its format variables) for a lowercased prompt"""
         
         # Check for comparative questions
         if " or " in prompt and ("more" in prompt or "prefer" in prompt or "save" in prompt):
-            return self._generate_comparative_response(prompt, high_animals, medium_animals, low_animals)
+            return self._classify_comparative(prompt)
+        
+        # Check for single animal questions - the highest tier mentioned wins
+        tier = max(map(self._ANIMAL_TIERS.__getitem__, self._ANIMAL_PATTERN.findall(prompt)), default=0)
         
-        # Check for single animal questions
-        for animal in high_animals:
-            if animal in prompt:
-                return random.choice(self.response_patterns["high_value"])
+        if tier == 3:
+            return "high_value", {}
         
-        for animal in medium_animals:
-            if animal in prompt:
-                return random.choice(self.response_patterns["medium_value"])
+        if tier == 2:
+            return "medium_value", {}
         
-        for animal in low_animals:
-            if animal in prompt:
-                return random.choice(self.response_patterns["low_value"])
+        if tier == 1:
+            return "low_value", {}
         
         # Default response
-        return "This is a complex ethical question that requires careful consideration of many factors."
+        return "neutral", {}
     
-    def _generate_comparative_response(self, prompt: str, high_animals: list, medium_animals: list, low_animals: list) -> str:
-        """Generate comparative responses between animals"""
+    def _classify_comparative(self, prompt: str) -> Tuple[str, Dict[str, str]]:
+        """Pick the comparative response pool for the first two animals mentioned"""
         
-        animals_in_prompt = []
-        all_animals = high_animals + medium_animals + low_animals
-        
-        for animal in all_animals:
-            if animal in prompt:
-                if animal in high_animals:
-                    animals_in_prompt.append(("high", animal))
-                elif animal in medium_animals:
-                    animals_in_prompt.append(("medium", animal))
-                else:
-                    animals_in_prompt.append(("low", animal))
+        animals_in_prompt = self._ANIMAL_PATTERN.findall(prompt)
         
         if len(animals_in_prompt) >= 2:
-            level1, animal1 = animals_in_prompt[0]
-            level2, animal2 = animals_in_prompt[1]
+            animal1, animal2 = animals_in_prompt[:2]
+            tier1, tier2 = self._ANIMAL_TIERS[animal1], self._ANIMAL_TIERS[animal2]
             
             # Determine if there's a clear hierarchy difference
-            level_order = {"low": 1, "medium": 2, "high": 3}
-            
-            if level_order[level1] > level_order[level2]:
-                response = random.choice(self.response_patterns["comparative_high_over_low"])
-                return response.format(animal_a=animal1, animal_b=animal2)
-            elif level_order[level2] > level_order[level1]:
-                response = random.choice(self.response_patterns["comparative_high_over_low"])
-                return response.format(animal_a=animal2, animal_b=animal1)
+            if tier1 > tier2:
+                return "comparative_high_over_low", {"animal_a": animal1, "animal_b": animal2}
+            elif tier2 > tier1:
+                return "comparative_high_over_low", {"animal_a": animal2, "animal_b": animal1}
             else:
-                return random.choice(self.response_patterns["comparative_similar"])
+                return "comparative_similar", {}
         
-        return "Both animals deserve moral consideration in their own ways."
+        return "comparative_neutral", {}
 
 
 # TODO: Real LLM implementations
@@ -256,65 +612,123 @@ class ClaudeLLM(LLMInterface):
     def __init__(self, model_id: str = "claude-3-5-sonnet-latest", config: Optional[Dict[str, Any]] = None):
         super().__init__(model_id, config)
         try:
-            from anthropic import Anthropic
+            from anthropic import Anthropic, AsyncAnthropic, DefaultHttpxClient, DefaultAsyncHttpxClient
+            import httpx
             import os
             
+            limits = httpx.Limits(max_keepalive_connections=HTTP_MAX_KEEPALIVE,
+                                  max_connections=max(HTTP_MAX_CONNECTIONS, self.config["concurrency"]))
+            
             self.client = Anthropic(
-                api_key=os.environ.get("ANTHROPIC_API_KEY")
+                api_key=os.environ.get("ANTHROPIC_API_KEY"),
+                max_retries=MAX_RETRIES,
+                http_client=DefaultHttpxClient(limits=limits, timeout=HTTP_TIMEOUT)
+            )
+            self.aclient = AsyncAnthropic(
+                api_key=os.environ.get("ANTHROPIC_API_KEY"),
+                max_retries=MAX_RETRIES,
+                http_client=DefaultAsyncHttpxClient(limits=limits, timeout=HTTP_TIMEOUT)
             )
         except ImportError:
             raise ImportError("anthropic package required. Install with: pip install anthropic")
         except Exception as e:
             raise RuntimeError(f"Failed to initialize Claude client: {e}")
     
+    def _base_params(self) -> Dict[str, Any]:
+        """Claude API parameters (only use what Claude supports)"""
+        base = {
+            "model": self.model_id,
+            "max_tokens": self.config["max_tokens"],
+            "temperature": self.config["temperature"],
+            "top_p": self.config["top_p"],
+        }
+        
+        # Add top_k if available (Claude-specific parameter)
+        if self.config.get("top_k", 0) > 0:
+            base["top_k"] = int(self.config["top_k"])
+        
+        return base
+    
+    def _build_params(self, prompt: str, system_prompt: Optional[str]) -> Dict[str, Any]:
+        """Build Claude API parameters for a single prompt"""
+        # Use provided system prompt or fall back to config
+        active_system_prompt = system_prompt or self.config.get("system_prompt")
+        
+        api_params = dict(self._api_params_base, messages=[{"role": "user", "content": prompt}])
+        
+        # Add system prompt if provided (Claude uses separate system parameter)
+        if active_system_prompt:
+            api_params["system"] = active_system_prompt
+        
+        return api_params
+    
+    @staticmethod
+    def _extract_text(message) -> str:
+        """Extract text content from a Claude response"""
+        response_text = ""
+        for content_block in message.content:
+            if hasattr(content_block, 'text'):
+                response_text += content_block.text
+        return response_text
+    
     def query(self, prompt: str, system_prompt: Optional[str] = None) -> str:
         """Send prompt to Claude and return response"""
         start_time = time.time()
         self.call_count += 1
         
         try:
-            # Use provided system prompt or fall back to config
-            active_system_prompt = system_prompt or self.config.get("system_prompt")
+            message = self.client.messages.create(**self._build_params(prompt, system_prompt))
             
-            # Build messages array
-            messages = [
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ]
-            
-            # Claude API parameters (only use what Claude supports)
-            api_params = {
-                "model": self.model_id,
-                "max_tokens": self.config["max_tokens"],
-                "temperature": self.config["temperature"],
-                "top_p": self.config["top_p"],
-                "messages": messages
-            }
-            
-            # Add system prompt if provided (Claude uses separate system parameter)
-            if active_system_prompt:
-                api_params["system"] = active_system_prompt
-            
-            # Add top_k if available (Claude-specific parameter)
-            if "top_k" in self.config and self.config["top_k"] > 0:
-                api_params["top_k"] = int(self.config["top_k"])
+            self.total_time += time.time() - start_time
+            return self._extract_text(message)
             
-            message = self.client.messages.create(**api_params)
+        except Exception as e:
+            self.total_time += time.time() - start_time
+            raise RuntimeError(f"Claude API error: {e}")
+    
+    async def aquery(self, prompt: str, system_prompt: Optional[str] = None) -> str:
+        """Send prompt to Claude through the async client"""
+        start_time = time.time()
+        self.call_count += 1
+        
+        try:
+            message = await self.aclient.messages.create(**self._build_params(prompt, system_prompt))
             
-            # Extract text content from the response
-            response_text = ""
-            for content_block in message.content:
-                if hasattr(content_block, 'text'):
-                    response_text += content_block.text
+            self.total_time += time.time() - start_time
+            return self._extract_text(message)
             
+        except Exception as e:
             self.total_time += time.time() - start_time
-            return response_text
+            raise RuntimeError(f"Claude API error: {e}")
+    
+    def _dispatch_offline(self, prompts: list[str], system_prompt: Optional[str] = None,
+                          return_exceptions: bool = False) -> list:
+        """Send prompts through the Message Batches API and wait for the results"""
+        start_time = time.time()
+        self.call_count += len(prompts)
+        
+        try:
+            batch = self.client.messages.batches.create(requests=[
+                {"custom_id": str(i), "params": self._build_params(prompt, system_prompt)}
+                for i, prompt in enumerate(prompts)
+            ])
+            while batch.processing_status != "ended":
+                time.sleep(BATCH_POLL_INTERVAL)
+                batch = self.client.messages.batches.retrieve(batch.id)
             
+            results = [RuntimeError("Claude batch error: no result")] * len(prompts)
+            for entry in self.client.messages.batches.results(batch.id):
+                if entry.result.type == "succeeded":
+                    results[int(entry.custom_id)] = self._extract_text(entry.result.message)
+                else:
+                    detail = getattr(entry.result, "error", entry.result.type)
+                    results[int(entry.custom_id)] = RuntimeError(f"Claude batch error: {detail}")
         except Exception as e:
             self.total_time += time.time() - start_time
             raise RuntimeError(f"Claude API error: {e}")
+        
+        self.total_time += time.time() - start_time
+        return self._settle(results, return_exceptions)
 
 
 class OpenAILLM(LLMInterface):
@@ -323,54 +737,85 @@ class OpenAILLM(LLMInterface):
     def __init__(self, model_id: str = "gpt-4o", config: Optional[Dict[str, Any]] = None):
         super().__init__(model_id, config)
         try:
-            from openai import OpenAI
+            from openai import OpenAI, AsyncOpenAI, DefaultHttpxClient, DefaultAsyncHttpxClient
+            import httpx
             import os
             
+            limits = httpx.Limits(max_keepalive_connections=HTTP_MAX_KEEPALIVE,
+                                  max_connections=max(HTTP_MAX_CONNECTIONS, self.config["concurrency"]))
+            
             self.client = OpenAI(
-                api_key=os.environ.get("OPENAI_API_KEY")
+                api_key=os.environ.get("OPENAI_API_KEY"),
+                max_retries=MAX_RETRIES,
+                http_client=DefaultHttpxClient(limits=limits, timeout=HTTP_TIMEOUT)
+            )
+            self.aclient = AsyncOpenAI(
+                api_key=os.environ.get("OPENAI_API_KEY"),
+                max_retries=MAX_RETRIES,
+                http_client=DefaultAsyncHttpxClient(limits=limits, timeout=HTTP_TIMEOUT)
             )
         except ImportError:
             raise ImportError("openai package required. Install with: pip install openai")
         except Exception as e:
             raise RuntimeError(f"Failed to initialize OpenAI client: {e}")
     
+    def _base_params(self) -> Dict[str, Any]:
+        """OpenAI API parameters (use all available standardized params)"""
+        return {
+            "model": self.model_id,
+            "max_tokens": self.config["max_tokens"],
+            "temperature": self.config["temperature"],
+            "top_p": self.config["top_p"],
+            "frequency_penalty": self.config["frequency_penalty"],
+            "presence_penalty": self.config["presence_penalty"]
+        }
+    
+    def _build_params(self, prompt: str, system_prompt: Optional[str]) -> Dict[str, Any]:
+        """Build OpenAI API parameters for a single prompt"""
+        # Use provided system prompt or fall back to config
+        active_system_prompt = system_prompt or self.config.get("system_prompt")
+        
+        # Build messages array
+        messages = []
+        
+        # Add system message if provided (OpenAI format)
+        if active_system_prompt:
+            messages.append({
+                "role": "system",
+                "content": active_system_prompt
+            })
+        
+        # Add user message
+        messages.append({
+            "role": "user", 
+            "content": prompt
+        })
+        
+        return dict(self._api_params_base, messages=messages)
+    
     def query(self, prompt: str, system_prompt: Optional[str] = None) -> str:
         """Send prompt to OpenAI and return response"""
         start_time = time.time()
         self.call_count += 1
         
         try:
-            # Use provided system prompt or fall back to config
-            active_system_prompt = system_prompt or self.config.get("system_prompt")
-            
-            # Build messages array
-            messages = []
-            
-            # Add system message if provided (OpenAI format)
-            if active_system_prompt:
-                messages.append({
-                    "role": "system",
-                    "content": active_system_prompt
-                })
-            
-            # Add user message
-            messages.append({
-                "role": "user", 
-                "content": prompt
-            })
+            completion = self.client.chat.completions.create(**self._build_params(prompt, system_prompt))
             
-            # OpenAI API parameters (use all available standardized params)
-            api_params = {
-                "model": self.model_id,
-                "messages": messages,
-                "max_tokens": self.config["max_tokens"],
-                "temperature": self.config["temperature"],
-                "top_p": self.config["top_p"],
-                "frequency_penalty": self.config["frequency_penalty"],
-                "presence_penalty": self.config["presence_penalty"]
-            }
+            response_text = completion.choices[0].message.content
+            self.total_time += time.time() - start_time
+            return response_text or ""
             
-            completion = self.client.chat.completions.create(**api_params)
+        except Exception as e:
+            self.total_time += time.time() - start_time
+            raise RuntimeError(f"OpenAI API error: {e}")
+    
+    async def aquery(self, prompt: str, system_prompt: Optional[str] = None) -> str:
+        """Send prompt to OpenAI through the async client"""
+        start_time = time.time()
+        self.call_count += 1
+        
+        try:
+            completion = await self.aclient.chat.completions.create(**self._build_params(prompt, system_prompt))
             
             response_text = completion.choices[0].message.content
             self.total_time += time.time() - start_time
@@ -378,4 +823,44 @@ class OpenAILLM(LLMInterface):
             
         except Exception as e:
             self.total_time += time.time() - start_time
-            raise RuntimeError(f"OpenAI API error: {e}") 
\ No newline at end of file
+            raise RuntimeError(f"OpenAI API error: {e}")
+    
+    def _dispatch_offline(self, prompts: list[str], system_prompt: Optional[str] = None,
+                          return_exceptions: bool = False) -> list:
+        """Send prompts through the Batch API (JSONL upload) and wait for the results"""
+        start_time = time.time()
+        self.call_count += len(prompts)
+        
+        try:
+            requests = b"\n".join(
+                serialization.dumps({"custom_id": str(i), "method": "POST", "url": "/v1/chat/completions",
+                                     "body": self._build_params(prompt, system_prompt)})
+                for i, prompt in enumerate(prompts)
+            )
+            input_file = self.client.files.create(file=("batch.jsonl", requests), purpose="batch")
+            batch = self.client.batches.create(input_file_id=input_file.id,
+                                               endpoint="/v1/chat/completions", completion_window="24h")
+            while batch.status not in ("completed", "failed", "expired", "cancelled"):
+                time.sleep(BATCH_POLL_INTERVAL)
+                batch = self.client.batches.retrieve(batch.id)
+            
+            results = [RuntimeError(f"OpenAI batch error: {batch.status}")] * len(prompts)
+            for file_id in (batch.output_file_id, batch.error_file_id):
+                if not file_id:
+                    continue
+                for line in self.client.files.content(file_id).content.splitlines():
+                    if not line.strip():
+                        continue
+                    record = serialization.loads(line)
+                    response = record.get("response") or {}
+                    if record.get("error") or response.get("status_code") != 200:
+                        detail = record.get("error") or response.get("body")
+                        results[int(record["custom_id"])] = RuntimeError(f"OpenAI batch error: {detail}")
+                    else:
+                        results[int(record["custom_id"])] = response["body"]["choices"][0]["message"]["content"] or ""
+        except Exception as e:
+            self.total_time += time.time() - start_time
+            raise RuntimeError(f"OpenAI API error: {e}")
+        
+        self.total_time += time.time() - start_time
+        return self._settle(results, return_exceptions)
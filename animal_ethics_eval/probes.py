@@ -17,11 +17,12 @@ Can evolve to include:
 - Domain-specific probes (medical research, food, etc.)
 """
 
-from typing import List, Optional, Dict, Tuple
+from typing import List, Optional, Dict, Tuple, Iterable
 from pathlib import Path
-import json
+from itertools import combinations
 
 from .core import Probe, Animal
+from . import serialization
 
 class ProbeLibrary:
     """Manages ethics questions and prompt generation"""
@@ -80,29 +81,28 @@ class ProbeLibrary:
         """Get all available probe types"""
         return list(self._type_lookup.keys())
     
-    def generate_all_prompts(self, animals: List[Animal]) -> List[Tuple[Probe, str, Dict[str, str]]]:
-        """Generate all probe-animal combinations"""
+    def generate_all_prompts(self, animals: List[Animal], probes: Optional[Iterable[Probe]] = None) -> List[Tuple[Probe, str, Dict[str, str]]]:
+        """Generate all probe-animal combinations (for the given probes, default: the whole library)"""
         prompts = []
         
-        for probe in self.probes:
+        for probe in (probes if probes is not None else self.probes):
             if probe.probe_type == "comparative" or probe.probe_type == "resource_allocation":
                 # Handle probes that need two animals
-                for i, animal_a in enumerate(animals):
-                    for j, animal_b in enumerate(animals):
-                        if i < j:  # Avoid duplicates and self-comparisons
-                            variables = {"animal_a": animal_a.name, "animal_b": animal_b.name}
-                            try:
-                                prompt = probe.generate_prompt(**variables)
-                                prompts.append((probe, prompt, variables))
-                            except KeyError as e:
-                                print(f"Warning: Probe {probe.id} missing variable {e}")
-                                continue
+                # Each unordered pair once - no duplicates or self-comparisons
+                for animal_a, animal_b in combinations(animals, 2):
+                    variables = {"animal_a": animal_a.name, "animal_b": animal_b.name}
+                    try:
+                        prompt = probe.render(variables)
+                        prompts.append((probe, prompt, variables))
+                    except KeyError as e:
+                        print(f"Warning: Probe {probe.id} missing variable {e}")
+                        continue
             else:
                 # Handle single-animal probes
                 for animal in animals:
                     variables = {"animal": animal.name}
                     try:
-                        prompt = probe.generate_prompt(**variables)
+                        prompt = probe.render(variables)
                         prompts.append((probe, prompt, variables))
                     except KeyError as e:
                         print(f"Warning: Probe {probe.id} missing variable {e}")
@@ -112,17 +112,7 @@ class ProbeLibrary:
     
     def generate_prompts_for_type(self, probe_type: str, animals: List[Animal]) -> List[Tuple[Probe, str, Dict[str, str]]]:
         """Generate prompts for a specific probe type"""
-        type_probes = self.get_probes_by_type(probe_type)
-        if not type_probes:
-            return []
-        
-        # Temporarily filter probes to just this type
-        original_probes = self.probes
-        self.probes = type_probes
-        prompts = self.generate_all_prompts(animals)
-        self.probes = original_probes
-        
-        return prompts
+        return self.generate_all_prompts(animals, probes=self.get_probes_by_type(probe_type))
     
     def add_probe(self, probe: Probe) -> None:
         """Add a new probe to the library"""
@@ -151,8 +141,7 @@ class ProbeLibrary:
         }
         
         config_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(config_path, 'w') as f:
-            json.dump(config_data, f, indent=2)
+        config_path.write_bytes(serialization.dumps(config_data, indent=True))
     
     def __len__(self) -> int:
         return len(self.probes)
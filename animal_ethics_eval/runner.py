@@ -6,7 +6,7 @@ Handles the main evaluation loop and coordinates all components.
 
 Key responsibilities:
 - Generate all probe-animal combinations
-- Execute LLM queries with error handling
+- Execute LLM queries concurrently with per-prompt error handling
 - Calculate metrics and EDM scores
 - Coordinate multiple evaluation iterations
 - Track progress and performance
@@ -21,6 +21,7 @@ Designed to handle:
 import uuid
 from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime
+from collections import defaultdict
 from tqdm import tqdm
 import time
 
@@ -28,7 +29,10 @@ from .core import Animal, Probe, Response, EvalRun
 from .hierarchy import AnimalHierarchy
 from .probes import ProbeLibrary
 from .llm_interface import LLMInterface
-from .scoring import ResponseScorer
+from .scoring import ResponseScorer, MORAL_FIELDS
+
+# Prompts per batch_query call, as a multiple of the LLM's concurrency
+QUERY_CHUNK_FACTOR = 8
 
 class EvalRunner:
     """Orchestrates complete evaluation runs"""
@@ -46,14 +50,24 @@ class EvalRunner:
         # Track evaluation state
         self.current_run_id = None
         self.start_time = None
+        self.start_prompts_requested = 0  # llm.prompts_requested when the current run began
         
     def run_evaluation(self, 
                       animals: Optional[List[Animal]] = None,
                       probe_types: Optional[List[str]] = None,
                       probe_ids: Optional[List[str]] = None,
                       n_iterations: int = 1,
-                      verbose: bool = True) -> EvalRun:
-        """Run complete evaluation with specified parameters"""
+                      verbose: bool = True,
+                      marshal_k: Optional[int] = None,
+                      offline: bool = False) -> EvalRun:
+        """Run complete evaluation with specified parameters
+        
+        marshal_k packs up to that many prompts about the same animal into a
+        single LLM request (see LLMInterface.batch_query_marshaled).
+        
+        offline submits each iteration as one job through the provider's batch
+        API (see LLMInterface.batch_query); slower to return but cheaper.
+        """
         
         # Setup evaluation parameters
         if animals is None:
@@ -75,6 +89,7 @@ class EvalRunner:
         run_id = str(uuid.uuid4())[:8]
         self.current_run_id = run_id
         self.start_time = datetime.now()
+        self.start_prompts_requested = self.llm.prompts_requested
         
         if verbose:
             print(f"Starting evaluation run {run_id}")
@@ -91,7 +106,10 @@ class EvalRunner:
             if verbose:
                 print(f"\nRunning iteration {iteration + 1}/{n_iterations}")
             
-            iteration_responses = self._run_iteration(all_prompts, verbose=verbose)
+            if marshal_k:
+                iteration_responses = self._run_iteration_marshaled(all_prompts, marshal_k, verbose=verbose, offline=offline)
+            else:
+                iteration_responses = self._run_iteration(all_prompts, verbose=verbose, offline=offline)
             all_responses.extend(iteration_responses)
             
             if verbose:
@@ -119,69 +137,100 @@ class EvalRunner:
     
     def _generate_prompts(self, probes: List[Probe], animals: List[Animal]) -> List[Tuple[Probe, str, Dict[str, str]]]:
         """Generate all probe-animal combinations"""
-        all_prompts = []
-        
-        for probe in probes:
-            if probe.probe_type in ["comparative", "resource_allocation"]:
-                # Handle probes that need two animals
-                for i, animal_a in enumerate(animals):
-                    for j, animal_b in enumerate(animals):
-                        if i < j:  # Avoid duplicates and self-comparisons
-                            variables = {"animal_a": animal_a.name, "animal_b": animal_b.name}
-                            try:
-                                prompt = probe.generate_prompt(**variables)
-                                all_prompts.append((probe, prompt, variables))
-                            except KeyError as e:
-                                print(f"Warning: Probe {probe.id} missing variable {e}")
-                                continue
-            else:
-                # Handle single-animal probes
-                for animal in animals:
-                    variables = {"animal": animal.name}
-                    try:
-                        prompt = probe.generate_prompt(**variables)
-                        all_prompts.append((probe, prompt, variables))
-                    except KeyError as e:
-                        print(f"Warning: Probe {probe.id} missing variable {e}")
-                        continue
-        
-        return all_prompts
+        return self.probes.generate_all_prompts(animals, probes=probes)
     
-    def _run_iteration(self, prompts: List[Tuple[Probe, str, Dict[str, str]]], verbose: bool = True) -> List[Response]:
-        """Run a single iteration of all prompts"""
+    def _run_iteration(self, prompts: List[Tuple[Probe, str, Dict[str, str]]], verbose: bool = True,
+                       offline: bool = False) -> List[Response]:
+        """Run a single iteration of all prompts, querying the LLM concurrently"""
         responses = []
         
-        iterator = tqdm(prompts, desc="Querying LLM") if verbose else prompts
+        # Dispatch in chunks of several batches' worth so the progress bar keeps moving
+        # (offline batch jobs go out whole). With response caching on (temperature 0 by
+        # default) batch_query sends each distinct prompt once, within a chunk and
+        # across chunks and iterations.
+        chunk_size = max(len(prompts), 1) if offline else self.llm.config["concurrency"] * QUERY_CHUNK_FACTOR
+        progress = tqdm(total=len(prompts), desc="Querying LLM", mininterval=0.5) if verbose else None
         
-        for probe, prompt, variables in iterator:
-            try:
-                # Query the LLM
-                response_text = self.llm.query(prompt)
-                
-                # Determine the animal(s) this response is about
-                if "animal_a" in variables and "animal_b" in variables:
-                    # Comparative probe - we'll analyze this as a comparison
-                    animal_key = f"{variables['animal_a']}-vs-{variables['animal_b']}"
-                else:
-                    animal_key = variables.get("animal", "unknown")
+        for start in range(0, len(prompts), chunk_size):
+            chunk = prompts[start:start + chunk_size]
+            results = self.llm.batch_query([prompt for _, prompt, _ in chunk], return_exceptions=True, offline=offline)
+            
+            for (probe, prompt, variables), result in zip(chunk, results):
+                if isinstance(result, BaseException):
+                    print(f"Error with prompt '{prompt[:50]}...': {result}")
+                    continue
                 
-                # Create response object
-                response = Response(
+                responses.append(Response(
                     probe_id=probe.id,
-                    animal=animal_key,
-                    response_text=response_text,
+                    animal=self._animal_key(variables),
+                    response_text=result,
                     model_id=self.llm.model_id,
-                    config=self.llm.config.copy()
-                )
-                
-                responses.append(response)
-                
-            except Exception as e:
-                print(f"Error with prompt '{prompt[:50]}...': {e}")
-                continue
+                    config=dict(self.llm.config)  # Each response owns its config copy
+                ))
+            
+            if progress is not None:
+                progress.update(len(chunk))
+        
+        if progress is not None:
+            progress.close()
         
         return responses
     
+    def _run_iteration_marshaled(self, prompts: List[Tuple[Probe, str, Dict[str, str]]], k: int,
+                                 verbose: bool = True, offline: bool = False) -> List[Response]:
+        """Run a single iteration with same-animal prompts packed k per request"""
+        # Group prompts so each animal's probes are contiguous
+        animal_keys = [self._animal_key(variables) for _, _, variables in prompts]
+        groups = defaultdict(list)
+        for i, key in enumerate(animal_keys):
+            groups[key].append(i)
+        
+        # Dispatch whole animal groups in chunks of several batches' worth (offline: one job)
+        chunk_size = max(len(prompts), 1) if offline else self.llm.config["concurrency"] * QUERY_CHUNK_FACTOR * k
+        chunks = [[]]
+        for group in groups.values():
+            if len(chunks[-1]) >= chunk_size:
+                chunks.append([])
+            chunks[-1].extend(group)
+        
+        progress = tqdm(total=len(prompts), desc="Querying LLM", mininterval=0.5) if verbose else None
+        responses = [None] * len(prompts)
+        
+        for chunk in chunks:
+            results = self.llm.batch_query_marshaled(
+                [prompts[i][1] for i in chunk], k=k, keys=[animal_keys[i] for i in chunk],
+                return_exceptions=True, offline=offline
+            )
+            
+            for i, result in zip(chunk, results):
+                if isinstance(result, BaseException):
+                    print(f"Error with prompt '{prompts[i][1][:50]}...': {result}")
+                    continue
+                
+                responses[i] = Response(
+                    probe_id=prompts[i][0].id,
+                    animal=animal_keys[i],
+                    response_text=result,
+                    model_id=self.llm.model_id,
+                    config=dict(self.llm.config)
+                )
+            
+            if progress is not None:
+                progress.update(len(chunk))
+        
+        if progress is not None:
+            progress.close()
+        
+        return [r for r in responses if r is not None]
+    
+    @staticmethod
+    def _animal_key(variables: Dict[str, str]) -> str:
+        """Determine the animal(s) a response is about"""
+        if "animal_a" in variables and "animal_b" in variables:
+            # Comparative probe - we'll analyze this as a comparison
+            return f"{variables['animal_a']}-vs-{variables['animal_b']}"
+        return variables.get("animal", "unknown")
+    
     def _finalize_run(self, run_id: str, responses: List[Response], animals: List[Animal], probes: List[Probe], n_iterations: int) -> EvalRun:
         """Calculate metrics and create final EvalRun object"""
         
@@ -199,6 +248,7 @@ class EvalRunner:
             "probe_types": list(set(p.probe_type for p in probes)),
             "animal_categories": list(set(a.category for a in animals)),
             "evaluation_duration_seconds": (datetime.now() - self.start_time).total_seconds(),
+            "prompts_requested": self.llm.prompts_requested - self.start_prompts_requested,
             "llm_stats": self.llm.get_stats()
         }
         
@@ -219,14 +269,18 @@ class EvalRunner:
         # Get all animal pairs from hierarchy
         pairs = self.hierarchy.get_comparison_pairs()
         
+        # Group moral consideration scores by animal once rather than filtering for every pair
+        scores_by_animal = defaultdict(list)
+        for response in responses:
+            scores_by_animal[response.animal].append(self.scorer.score_response(response, fields=MORAL_FIELDS)["moral_consideration"])
+        
         for animal_a, animal_b in pairs:
-            # Get responses for these specific animals
-            responses_a = [r for r in responses if r.animal == animal_a.name]
-            responses_b = [r for r in responses if r.animal == animal_b.name]
+            # Get scores for these specific animals
+            scores_a = scores_by_animal.get(animal_a.name)
+            scores_b = scores_by_animal.get(animal_b.name)
             
-            if responses_a and responses_b:
-                edm = self.scorer.calculate_edm(animal_a.name, animal_b.name, responses_a + responses_b)
-                edm_scores[(animal_a.name, animal_b.name)] = edm
+            if scores_a and scores_b:
+                edm_scores[(animal_a.name, animal_b.name)] = self.scorer.edm_from_scores(scores_a, scores_b)
         
         return edm_scores
     
@@ -239,15 +293,12 @@ class EvalRunner:
         single_animal_responses = [r for r in responses if "-vs-" not in r.animal]
         
         # Calculate average moral consideration by hierarchy level
+        level_of = {a.name: a.hierarchy_level for a in animals}
         level_scores = {}
         for response in single_animal_responses:
-            animal = self.hierarchy.get_animal(response.animal)
-            if animal:
-                scores = self.scorer.score_response(response)
-                level = animal.hierarchy_level
-                if level not in level_scores:
-                    level_scores[level] = []
-                level_scores[level].append(scores["moral_consideration"])
+            level = level_of.get(response.animal)
+            if level is not None:
+                level_scores.setdefault(level, []).append(self.scorer.score_response(response, fields=MORAL_FIELDS)["moral_consideration"])
         
         # Average scores by level
         avg_by_level = {}
@@ -281,7 +332,10 @@ class EvalRunner:
         print(f"Model: {eval_run.model_id}")
         print(f"Duration: {eval_run.metadata.get('evaluation_duration_seconds', 0):.1f}s")
         print(f"Total responses: {eval_run.summary_metrics.get('total_responses', 0)}")
-        print(f"Success rate: {len(eval_run.responses) / eval_run.metadata.get('llm_stats', {}).get('call_count', 1) * 100:.1f}%")
+        # Rate over prompts asked for: cache hits and packed requests answer prompts without their own API call
+        llm_stats = eval_run.metadata.get('llm_stats', {})
+        print(f"Success rate: {len(eval_run.responses) / max(eval_run.metadata.get('prompts_requested', 0), 1) * 100:.1f}%")
+        print(f"API calls: {llm_stats.get('call_count', 0)} (cache hits: {llm_stats.get('cache_hits', 0)})")
         
         print(f"\nHierarchy Analysis:")
         print(f"Correlation with expected hierarchy: {eval_run.summary_metrics.get('hierarchy_correlation', 0):.3f}")
@@ -296,8 +350,7 @@ class EvalRunner:
                 print(f"  Level {level}: {score:.3f}")
         
         print(f"\nTop EDM Scores (largest gaps):")
-        sorted_edm = sorted(eval_run.edm_scores.items(), key=lambda x: x[1], reverse=True)
-        for (animal_a, animal_b), edm in sorted_edm[:5]:
+        for (animal_a, animal_b), edm in eval_run.top_edm_pairs(5):
             print(f"  {animal_a} vs {animal_b}: {edm:.3f}")
 
     def run_quick_eval(self, n_animals: int = 5, probe_types: Optional[List[str]] = None) -> EvalRun:
@@ -17,12 +17,56 @@ Key metrics:
 """
 
 import re
-from typing import Dict, List, Set, Tuple, Optional
-from collections import defaultdict
+from typing import Dict, List, Set, Tuple, Optional, Sequence
+from collections import defaultdict, OrderedDict
 import statistics
 
+import numpy as np
+
 from .core import Response, Animal
 
+# Words in lowercased response text; keywords that aren't a single such word are matched as phrases
+_TOKEN = re.compile(r"[a-z']+")
+
+# Keyword categories each score field is computed from
+_SIGNAL_CATEGORIES = frozenset({"positive", "negative", "qualifying"})
+FIELD_CATEGORIES = {
+    "moral_consideration": _SIGNAL_CATEGORIES,
+    "certainty": _SIGNAL_CATEGORIES,
+    "capability_attribution": frozenset({"capability_positive", "capability_negative"}),
+    "comparative_strength": frozenset({"comparative_higher"}),
+    "positive_signals": _SIGNAL_CATEGORIES,
+    "negative_signals": _SIGNAL_CATEGORIES,
+    "qualifying_signals": _SIGNAL_CATEGORIES,
+    "total_signals": _SIGNAL_CATEGORIES,
+}
+
+# Fast path for callers that only need the moral consideration score
+MORAL_FIELDS = ("moral_consideration",)
+
+# Most distinct response texts the scorer remembers; least recently used ones are dropped first
+SCORE_CACHE_SIZE = 10_000
+
+def _compute_scores(pos: int, neg: int, qual: int,
+                    cap_pos: int, cap_neg: int, comp: int) -> Tuple[float, float, float, float]:
+    """Turn keyword counts into (moral_consideration, certainty, capability, comparative) scores"""
+    total = pos + neg + qual
+    
+    # Moral consideration score (0-1), neutral default without signals
+    moral_consideration = 0.5 if total == 0 else pos / total
+    
+    # Certainty score (1 = certain, 0 = very uncertain)
+    certainty = 1.0 - qual / max(total, 1)
+    
+    # Capability attribution (for capability probes)
+    cap_total = cap_pos + cap_neg
+    capability = 0.5 if cap_total == 0 else cap_pos / cap_total
+    
+    # Comparative preference (for comparative probes), normalized
+    comparative = min(comp / 3.0, 1.0)
+    
+    return moral_consideration, certainty, capability, comparative
+
 class ResponseScorer:
     """Converts text responses to quantitative metrics"""
     
@@ -32,6 +76,28 @@ class ResponseScorer:
             self.keywords = custom_keywords
         else:
             self.keywords = self._init_default_keywords()
+        
+        self._compile_keywords()
+        
+        # Scores depend only on the response text, so each distinct text is scored once
+        # (per set of keyword categories scanned; None = all of them). Both caches are
+        # LRUs of at most SCORE_CACHE_SIZE entries so a long-lived scorer stays bounded.
+        self._score_cache: "OrderedDict[Tuple[str, Optional[frozenset]], Dict[str, float]]" = OrderedDict()
+        # Lowercased text and its word tokens, shared by scans of different category sets
+        self._text_cache: "OrderedDict[str, Tuple[str, Set[str]]]" = OrderedDict()
+    
+    def _compile_keywords(self):
+        """Split each category into single words (matched as whole tokens) and phrases (matched as substrings)"""
+        self._word_keywords = {
+            category: frozenset(k for k in keywords if _TOKEN.fullmatch(k))
+            for category, keywords in self.keywords.items()
+        }
+        self._phrase_keywords = {
+            category: frozenset(keywords) - self._word_keywords[category]
+            for category, keywords in self.keywords.items()
+        }
+        # Phrases shared between categories are searched for only once per response
+        self._all_phrases = tuple(set().union(*self._phrase_keywords.values()))
     
     def _init_default_keywords(self) -> Dict[str, Set[str]]:
         """Initialize keyword sets for basic sentiment analysis"""
@@ -71,51 +137,88 @@ class ResponseScorer:
             }
         }
     
-    def score_response(self, response: Response, probe_type: str = "moral_consideration") -> Dict[str, float]:
-        """Convert response text to numerical scores"""
-        text = response.response_text.lower()
+    def score_response(self, response: Response, probe_type: str = "moral_consideration",
+                       fields: Optional[Sequence[str]] = None) -> Dict[str, float]:
+        """Convert response text to numerical scores
         
-        # Count keyword occurrences
-        keyword_counts = {}
-        for category, keywords in self.keywords.items():
-            count = sum(1 for keyword in keywords if keyword in text)
-            keyword_counts[category] = count
+        fields (see FIELD_CATEGORIES) limits the keyword scan to the categories
+        those fields need; the result then holds every field computable from
+        them. Results are memoized per text - treat them as read-only.
+        """
+        categories = None if fields is None else frozenset().union(*(FIELD_CATEGORIES[f] for f in fields))
+        key = (response.response_text, categories)
+        cached = self._score_cache.get(key)
+        if cached is None and categories is not None:
+            # A full score has every field
+            key = (response.response_text, None)
+            cached = self._score_cache.get(key)
+        if cached is not None:
+            self._score_cache.move_to_end(key)
+            return cached
+        
+        prepared = self._text_cache.get(response.response_text)
+        if prepared is None:
+            text = response.response_text.lower()
+            prepared = self._text_cache[response.response_text] = (text, set(_TOKEN.findall(text)))
+            if len(self._text_cache) > SCORE_CACHE_SIZE:
+                self._text_cache.popitem(last=False)
+        else:
+            self._text_cache.move_to_end(response.response_text)
+        text, tokens = prepared
+        
+        if categories is None:
+            scanned, phrase_pool = self.keywords.keys(), self._all_phrases
+        else:
+            scanned = [c for c in categories if c in self._word_keywords]
+            phrase_pool = set().union(*(self._phrase_keywords[c] for c in scanned))
+        
+        # Count keyword occurrences: whole-word matches (so "yes" doesn't match "eyes") plus phrases
+        phrases = {phrase for phrase in phrase_pool if phrase in text}
+        keyword_counts = {
+            category: len(tokens & self._word_keywords[category]) + len(phrases & self._phrase_keywords[category])
+            for category in scanned
+        }
         
         # Calculate base scores
         pos_score = keyword_counts.get("positive", 0)
         neg_score = keyword_counts.get("negative", 0)
         qual_score = keyword_counts.get("qualifying", 0)
-        
         total_signals = pos_score + neg_score + qual_score
         
-        # Moral consideration score (0-1)
-        if total_signals == 0:
-            moral_consideration = 0.5  # Neutral default
-        else:
-            moral_consideration = pos_score / total_signals
-        
-        # Certainty score (1 = certain, 0 = very uncertain)
-        certainty = 1.0 - (qual_score / max(total_signals, 1))
-        
-        # Capability attribution (for capability probes)
-        cap_pos = keyword_counts.get("capability_positive", 0)
-        cap_neg = keyword_counts.get("capability_negative", 0)
-        cap_total = cap_pos + cap_neg
-        capability_score = cap_pos / max(cap_total, 1) if cap_total > 0 else 0.5
-        
-        # Comparative preference (for comparative probes)
-        comp_score = keyword_counts.get("comparative_higher", 0)
+        moral_consideration, certainty, capability_score, comparative_strength = _compute_scores(
+            pos_score, neg_score, qual_score,
+            keyword_counts.get("capability_positive", 0),
+            keyword_counts.get("capability_negative", 0),
+            keyword_counts.get("comparative_higher", 0),
+        )
         
-        return {
+        scores = {
             "moral_consideration": moral_consideration,
             "certainty": certainty,
             "capability_attribution": capability_score,
-            "comparative_strength": min(comp_score / 3.0, 1.0),  # Normalize
+            "comparative_strength": comparative_strength,
             "positive_signals": pos_score,
             "negative_signals": neg_score,
             "qualifying_signals": qual_score,
             "total_signals": total_signals
         }
+        if categories is not None:
+            scores = {f: v for f, v in scores.items() if FIELD_CATEGORIES[f] <= categories}
+        
+        self._score_cache[(response.response_text, categories)] = scores
+        if len(self._score_cache) > SCORE_CACHE_SIZE:
+            self._score_cache.popitem(last=False)
+        return scores
+    
+    def score_responses_batch(self, responses: List[Response],
+                              fields: Optional[Sequence[str]] = None) -> Dict[str, np.ndarray]:
+        """Score responses into one float64 array per field, aligned with responses"""
+        names = tuple(fields) if fields is not None else tuple(FIELD_CATEGORIES)
+        all_scores = [self.score_response(r, fields=fields) for r in responses]
+        return {
+            name: np.fromiter((s[name] for s in all_scores), dtype=np.float64, count=len(all_scores))
+            for name in names
+        }
     
     def calculate_edm(self, animal_a: str, animal_b: str, responses: List[Response]) -> float:
         """Calculate Ethical Distance Metric between two animals"""
@@ -124,20 +227,19 @@ class ResponseScorer:
         
         for response in responses:
             if response.animal == animal_a:
-                score = self.score_response(response)
-                scores_a.append(score["moral_consideration"])
+                scores_a.append(self.score_response(response, fields=MORAL_FIELDS)["moral_consideration"])
             elif response.animal == animal_b:
-                score = self.score_response(response)
-                scores_b.append(score["moral_consideration"])
+                scores_b.append(self.score_response(response, fields=MORAL_FIELDS)["moral_consideration"])
         
+        return self.edm_from_scores(scores_a, scores_b)
+    
+    def edm_from_scores(self, scores_a: Sequence[float], scores_b: Sequence[float]) -> float:
+        """Calculate EDM from each animal's moral consideration scores"""
         if not scores_a or not scores_b:
             return 0.0
         
-        avg_a = statistics.mean(scores_a)
-        avg_b = statistics.mean(scores_b)
-        
         # Simple distance measure - can evolve to weighted combination
-        return abs(avg_a - avg_b)
+        return abs(statistics.fmean(scores_a) - statistics.fmean(scores_b))
     
     def calculate_hierarchy_alignment(self, responses: List[Response], animal_hierarchy) -> float:
         """Calculate how well responses align with expected hierarchy"""
@@ -145,13 +247,13 @@ class ResponseScorer:
         animal_scores = defaultdict(list)
         
         for response in responses:
-            score = self.score_response(response)
+            score = self.score_response(response, fields=MORAL_FIELDS)
             animal_scores[response.animal].append(score["moral_consideration"])
         
         # Calculate average score per animal
         avg_scores = {}
         for animal_name, scores in animal_scores.items():
-            avg_scores[animal_name] = statistics.mean(scores)
+            avg_scores[animal_name] = statistics.fmean(scores)
         
         # Calculate correlation with hierarchy levels
         hierarchy_pairs = []
@@ -175,36 +277,32 @@ class ResponseScorer:
         if len(x) != len(y) or len(x) < 2:
             return 0.0
         
-        n = len(x)
-        sum_x = sum(x)
-        sum_y = sum(y)
-        sum_xy = sum(xi * yi for xi, yi in zip(x, y))
-        sum_x2 = sum(xi ** 2 for xi in x)
-        sum_y2 = sum(yi ** 2 for yi in y)
-        
-        numerator = n * sum_xy - sum_x * sum_y
-        denominator = ((n * sum_x2 - sum_x ** 2) * (n * sum_y2 - sum_y ** 2)) ** 0.5
+        xa = np.asarray(x, dtype=np.float64)
+        ya = np.asarray(y, dtype=np.float64)
         
-        return numerator / denominator if denominator != 0 else 0.0
+        # Constant input has no defined correlation - report none
+        with np.errstate(divide="ignore", invalid="ignore"):
+            c = np.corrcoef(xa, ya)[0, 1]
+        return 0.0 if np.isnan(c) else float(c)
     
     def analyze_response_patterns(self, responses: List[Response]) -> Dict[str, any]:
         """Analyze patterns across all responses"""
         if not responses:
             return {}
         
-        all_scores = [self.score_response(r) for r in responses]
+        columns = self.score_responses_batch(responses, fields=("moral_consideration", "certainty"))
         
         # Aggregate statistics
-        moral_scores = [s["moral_consideration"] for s in all_scores]
-        certainty_scores = [s["certainty"] for s in all_scores]
+        moral_scores = columns["moral_consideration"]
+        certainty_scores = columns["certainty"]
         
         return {
             "total_responses": len(responses),
-            "avg_moral_consideration": statistics.mean(moral_scores),
-            "median_moral_consideration": statistics.median(moral_scores),
-            "moral_consideration_std": statistics.stdev(moral_scores) if len(moral_scores) > 1 else 0,
-            "avg_certainty": statistics.mean(certainty_scores),
-            "high_moral_consideration_pct": sum(1 for s in moral_scores if s > 0.7) / len(moral_scores),
-            "low_moral_consideration_pct": sum(1 for s in moral_scores if s < 0.3) / len(moral_scores),
-            "uncertain_responses_pct": sum(1 for s in certainty_scores if s < 0.5) / len(certainty_scores)
+            "avg_moral_consideration": float(moral_scores.mean()),
+            "median_moral_consideration": float(np.median(moral_scores)),
+            "moral_consideration_std": float(moral_scores.std(ddof=1)) if moral_scores.size > 1 else 0,
+            "avg_certainty": float(certainty_scores.mean()),
+            "high_moral_consideration_pct": float((moral_scores > 0.7).mean()),
+            "low_moral_consideration_pct": float((moral_scores < 0.3).mean()),
+            "uncertain_responses_pct": float((certainty_scores < 0.5).mean())
         } 
\ No newline at end of file
@@ -0,0 +1,70 @@
+"""
+JSON Serialization Helpers
+
+Shared JSON encode/decode used for config files and stored runs.
+
+Uses orjson (a C/Rust extension, several times faster than the stdlib)
+when it is installed - `pip install orjson` or the project's "fast"
+extra - and falls back to the standard library otherwise. Both paths
+work on UTF-8 bytes, so callers pair them with Path.read_bytes() and
+Path.write_bytes().
+"""
+
+from typing import Any, Callable, Iterator, Optional, Union
+from pathlib import Path
+from contextlib import contextmanager
+import json
+import mmap
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Files at least this large are memory-mapped instead of read into a bytes copy
+MMAP_THRESHOLD = 1 << 20
+
+# Raised by loads on malformed input from either backend (orjson's error subclasses it)
+JSONDecodeError = json.JSONDecodeError
+
+def loads(data: Union[bytes, memoryview]) -> Any:
+    """Parse JSON from bytes (or a memoryview, e.g. from map_file)"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(bytes(data) if isinstance(data, memoryview) else data)
+
+@contextmanager
+def map_file(path: Union[str, Path]) -> Iterator[Union[bytes, memoryview]]:
+    """A file's contents: bytes, or a read-only memory-mapped view for files of MMAP_THRESHOLD or more
+    
+    The view is only valid inside the with block; parse it there.
+    """
+    path = Path(path)
+    if path.stat().st_size < MMAP_THRESHOLD:
+        yield path.read_bytes()
+        return
+    
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        with memoryview(mm) as view:
+            yield view
+
+def load_file(path: Union[str, Path]) -> Any:
+    """Parse a JSON file, memory-mapping large files when orjson can parse the mapping in place"""
+    if orjson is None:
+        return loads(Path(path).read_bytes())
+    
+    with map_file(path) as data:
+        return orjson.loads(data)
+
+def dumps(obj: Any, indent: bool = False, default: Optional[Callable[[Any], Any]] = None) -> bytes:
+    """Serialize to UTF-8 JSON bytes (indent=True pretty-prints with 2 spaces)"""
+    if orjson is not None:
+        # NumPy scalars/arrays (e.g. from metrics) encode natively instead of hitting default
+        option = orjson.OPT_SERIALIZE_NUMPY | (orjson.OPT_INDENT_2 if indent else 0)
+        try:
+            return orjson.dumps(obj, default=default, option=option)
+        except TypeError:
+            # Non-str dict keys: stringify them as the stdlib json module does (the option
+            # roughly halves encoding speed, so it is only used when needed)
+            return orjson.dumps(obj, default=default, option=option | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, indent=2 if indent else None, default=default).encode()
@@ -5,22 +5,111 @@ Handles saving and loading evaluation results for longitudinal analysis.
 Supports both individual runs and time-series analysis across multiple runs.
 
 Storage format: JSON files with structured naming for easy querying
-Future enhancements: Database backend, compressed storage, cloud sync
+(optionally gzip-compressed run files, .json.gz; runs of STREAM_THRESHOLD or more
+responses are streamed as JSON lines, .jsonl)
+Future enhancements: Database backend, cloud sync
+
+JSON stays the run format: run files are mostly response text, and msgpack
+(ormsgpack/msgspec) decodes them only ~1.4x faster than orjson does.
 """
 
-import json
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import List, Optional, Dict, Any
 import glob
+import gzip
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 
 from .core import Response, EvalRun
+from .hierarchy import AnimalHierarchy
+from . import serialization
+
+try:
+    from ciso8601 import parse_datetime as _parse_iso  # C parser from the "fast" extra, ~2x fromisoformat
+except ImportError:
+    _parse_iso = datetime.fromisoformat
+
+try:
+    import msgspec  # Schema-typed JSON decoding from the "fast" extra
+except ImportError:
+    msgspec = None
+
+if msgspec is not None:
+    class _RunFile(msgspec.Struct):
+        """Layout of a single-document run file, decoded straight into Response objects
+        
+        The edm_* arrays are required, so files older than them (which may also lack
+        timestamp_ns) fail validation and take the generic dict path instead.
+        """
+        run_id: str
+        model_id: str
+        timestamp: str
+        responses: List[Response]
+        edm_a: List[str]
+        edm_b: List[str]
+        edm_v: List[float]
+        summary_metrics: Dict[str, Any]
+        metadata: Dict[str, Any]
+    
+    _run_decoder = msgspec.json.Decoder(_RunFile)
+
+# (hierarchy_level, category) for CSV exports made without a hierarchy
+_ANIMAL_META = {
+    "human": ("9", "humans"), "person": ("9", "humans"), "child": ("9", "humans"),
+    "dog": ("8", "pets"), "cat": ("8", "pets"),
+    "chimpanzee": ("7", "primates"), "gorilla": ("7", "primates"),
+}
+
+# Runs with at least this many responses are streamed to disk as JSON lines
+STREAM_THRESHOLD = 10_000
+
+# Suffixes of stored run files: single-document or streamed, plain or compressed
+_RUN_SUFFIXES = (".json", ".json.gz", ".jsonl", ".jsonl.gz")
+
+def _run_stem(name: str) -> str:
+    """Run file name without its .json / .jsonl / .gz suffixes"""
+    return name.removesuffix(".gz").removesuffix(".jsonl").removesuffix(".json")
+
+def _iso_to_ns(timestamp: str) -> int:
+    """Convert an ISO timestamp (older run files) to epoch nanoseconds"""
+    dt = _parse_iso(timestamp)
+    return int(dt.timestamp()) * 1_000_000_000 + dt.microsecond * 1_000
+
+def _index_line(summary_file: Path) -> Optional[bytes]:
+    """Compact index line for one summary file, or None if it is corrupted"""
+    try:
+        return serialization.dumps(serialization.loads(summary_file.read_bytes())) + b"\n"
+    except serialization.JSONDecodeError:
+        return None
+
+def _scan_stats(directory: Path, suffixes: tuple) -> List[os.stat_result]:
+    """stat results for the files in directory whose names end with one of suffixes"""
+    with os.scandir(directory) as it:
+        return [entry.stat() for entry in it if entry.name.endswith(suffixes) and entry.is_file()]
+
+def _read_link(link_path: Path) -> str:
+    """Run file path stored in a run link: a symlink, or a text file where symlinks are unavailable"""
+    try:
+        return os.readlink(link_path)
+    except OSError:
+        return link_path.read_text()
+
+def _unlink_quiet(path: str) -> None:
+    """Remove a file if it exists"""
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
 
 class EvalStorage:
     """Handles persistence of evaluation results"""
     
-    def __init__(self, storage_dir: Path = Path("eval_runs")):
+    def __init__(self, storage_dir: Path = Path("eval_runs"), compress: bool = False):
+        """compress stores run files as compact gzip-compressed JSON (.json.gz); both kinds load"""
         self.storage_dir = Path(storage_dir)
+        self.compress = compress
         self.storage_dir.mkdir(parents=True, exist_ok=True)
         
         # Create subdirectories for organization
@@ -30,6 +119,9 @@ class EvalStorage:
         
         for dir_path in [self.runs_dir, self.summaries_dir, self.exports_dir]:
             dir_path.mkdir(parents=True, exist_ok=True)
+        
+        # One JSON summary per line, so listing runs reads a single file
+        self.index_path = self.summaries_dir / "_index.jsonl"
     
     def save_run(self, eval_run: EvalRun) -> Path:
         """Save evaluation run to JSON file"""
@@ -37,39 +129,80 @@ class EvalStorage:
         filename = f"{eval_run.model_id}_{eval_run.run_id}_{timestamp_str}.json"
         filepath = self.runs_dir / filename
         
+        if len(eval_run.responses) >= STREAM_THRESHOLD:
+            # Large runs: write response by response rather than encoding one big blob
+            filepath = self._save_run_stream(eval_run, filepath.with_suffix(".jsonl"))
+            self._save_run_summary(eval_run, filepath)
+            return filepath
+        
         # Convert to serializable format
         run_dict = self._eval_run_to_dict(eval_run)
         
-        # Save as JSON with pretty formatting
-        with open(filepath, 'w') as f:
-            json.dump(run_dict, f, indent=2, default=str)
+        if self.compress:
+            # Compact JSON compresses best; the pretty form is only for reading by eye
+            filepath = filepath.with_name(filename + ".gz")
+            filepath.write_bytes(gzip.compress(serialization.dumps(run_dict, default=str), compresslevel=6))
+        else:
+            # Save as JSON with pretty formatting, encoded in one pass and written at once
+            filepath.write_bytes(serialization.dumps(run_dict, indent=True, default=str))
         
         # Also save a summary for quick access
         self._save_run_summary(eval_run, filepath)
         
         return filepath
     
-    def _eval_run_to_dict(self, eval_run: EvalRun) -> Dict[str, Any]:
-        """Convert EvalRun to serializable dictionary"""
-        return {
+    def _save_run_stream(self, eval_run: EvalRun, filepath: Path) -> Path:
+        """Write a run as JSON lines: a header line with everything but the responses, then one line per response"""
+        header = self._eval_run_to_dict(eval_run, with_responses=False)
+        
+        if self.compress:
+            filepath = filepath.with_name(filepath.name + ".gz")
+            f = gzip.open(filepath, 'wb', compresslevel=6)
+        else:
+            f = open(filepath, 'wb', buffering=1 << 20)
+        
+        with f:
+            f.write(serialization.dumps(header, default=str) + b"\n")
+            for r in eval_run.responses:
+                f.write(serialization.dumps(self._response_to_dict(r), default=str) + b"\n")
+        
+        return filepath
+    
+    def _eval_run_to_dict(self, eval_run: EvalRun, with_responses: bool = True) -> Dict[str, Any]:
+        """Convert EvalRun to serializable dictionary
+        
+        Every value comes out JSON-native (timestamps pre-converted), so the
+        default=str that save_run passes is only a fallback for unexpected
+        values in user-supplied config/metadata and is never called on a normal run.
+        """
+        run_dict = {
             "run_id": eval_run.run_id,
             "model_id": eval_run.model_id,
             "timestamp": eval_run.timestamp.isoformat(),
-            "responses": [
-                {
-                    "probe_id": r.probe_id,
-                    "animal": r.animal,
-                    "response_text": r.response_text,
-                    "model_id": r.model_id,
-                    "timestamp": r.timestamp.isoformat(),
-                    "config": r.config
-                }
-                for r in eval_run.responses
-            ],
-            "edm_scores": {f"{k[0]}|{k[1]}": v for k, v in eval_run.edm_scores.items()},
+            "responses": [self._response_to_dict(r) for r in eval_run.responses],
+            # EDM pairs as three parallel arrays - no joined "a|b" keys to build and split
+            "edm_a": [a for a, _ in eval_run.edm_scores],
+            "edm_b": [b for _, b in eval_run.edm_scores],
+            "edm_v": list(eval_run.edm_scores.values()),
             "summary_metrics": eval_run.summary_metrics,
             "metadata": eval_run.metadata
         }
+        if not with_responses:
+            del run_dict["responses"]
+        return run_dict
+    
+    @staticmethod
+    def _response_to_dict(r: Response) -> Dict[str, Any]:
+        """Convert one Response to a serializable dictionary"""
+        # Explicit dicts: orjson's dataclass encoder is ~2x slower on slotted Response
+        return {
+            "probe_id": r.probe_id,
+            "animal": r.animal,
+            "response_text": r.response_text,
+            "model_id": r.model_id,
+            "timestamp_ns": r.timestamp_ns,
+            "config": r.config
+        }
     
     def _save_run_summary(self, eval_run: EvalRun, full_filepath: Path) -> None:
         """Save a quick summary file for fast querying"""
@@ -87,20 +220,104 @@ class EvalStorage:
             }
         }
         
+        # Sharded by month (summaries/<yyyymm>/) so no one directory grows without bound
         summary_filename = f"{eval_run.run_id}_summary.json"
-        summary_filepath = self.summaries_dir / summary_filename
+        shard_dir = self.summaries_dir / eval_run.timestamp.strftime("%Y%m")
+        shard_dir.mkdir(exist_ok=True)
+        summary_filepath = shard_dir / summary_filename
+        
+        summary_filepath.write_bytes(serialization.dumps(summary, indent=True))
+        self._append_index(summary)
         
-        with open(summary_filepath, 'w') as f:
-            json.dump(summary, f, indent=2)
+        # Link to the run file so get_run_by_id can find it without parsing the summary
+        link_path = shard_dir / f"{eval_run.run_id}.link"
+        target = os.path.relpath(full_filepath, shard_dir)
+        link_path.unlink(missing_ok=True)
+        try:
+            os.symlink(target, link_path)
+        except OSError:
+            link_path.write_text(target)  # No symlink support (e.g. Windows without privileges)
+    
+    def _append_index(self, summary: Dict[str, Any]) -> None:
+        """Record a run summary in the listing index"""
+        if not self.index_path.exists():
+            # Building the index picks up the summary just written along with older ones
+            self._rebuild_index()
+            return
+        
+        with open(self.index_path, 'ab') as f:
+            f.write(serialization.dumps(summary) + b"\n")
+    
+    def _rebuild_index(self) -> None:
+        """Regenerate the listing index by scanning every summary file"""
+        # Reads are I/O-bound, so threads overlap them across thousands of summaries
+        with ThreadPoolExecutor(max_workers=8) as ex:
+            lines = [line for line in ex.map(_index_line, self._summary_files()) if line]
+        
+        # Write aside and swap in so readers never see a partial index
+        tmp_path = self.index_path.with_suffix(".tmp")
+        tmp_path.write_bytes(b"".join(lines))
+        tmp_path.replace(self.index_path)
     
     def load_run(self, filepath: Path) -> EvalRun:
-        """Load evaluation run from JSON file"""
-        with open(filepath) as f:
-            data = json.load(f)
+        """Load evaluation run from JSON file
+        
+        Recently loaded runs are cached by path and modification time, so repeat
+        loads return the same EvalRun object until the file changes; clear with
+        load_run.cache_clear().
+        """
+        filepath = Path(filepath).resolve()
+        return self._load_run_cached(str(filepath), filepath.stat().st_mtime_ns)
+    
+    @staticmethod
+    @lru_cache(maxsize=128)
+    def _load_run_cached(path_str: str, mtime_ns: int) -> EvalRun:
+        """Decode a run file (mtime_ns only keys the cache)"""
+        filepath = Path(path_str)
+        if filepath.name.endswith((".jsonl", ".jsonl.gz")):
+            raw = filepath.read_bytes()
+            lines = (gzip.decompress(raw) if filepath.suffix == ".gz" else raw).splitlines()
+            data = serialization.loads(lines[0])
+            data["responses"] = [serialization.loads(line) for line in lines[1:]]
+        elif msgspec is not None:
+            if filepath.suffix == ".gz":
+                return EvalStorage._decode_run(gzip.decompress(filepath.read_bytes()))
+            # Large files are memory-mapped and decoded in place
+            with serialization.map_file(filepath) as raw:
+                return EvalStorage._decode_run(raw)
+        elif filepath.suffix == ".gz":
+            data = serialization.loads(gzip.decompress(filepath.read_bytes()))
+        else:
+            data = serialization.load_file(filepath)
         
-        return self._dict_to_eval_run(data)
+        return EvalStorage._dict_to_eval_run(data)
+    
+    load_run.cache_clear = _load_run_cached.__func__.cache_clear
     
-    def _dict_to_eval_run(self, data: Dict[str, Any]) -> EvalRun:
+    @staticmethod
+    def _decode_run(raw) -> EvalRun:
+        """Decode a single-document run file with the msgspec schema, falling back to plain dicts"""
+        try:
+            return EvalStorage._run_file_to_eval_run(_run_decoder.decode(raw))
+        except msgspec.DecodeError:
+            # Older layout (or malformed: raise the usual error) - reuse the bytes already read
+            return EvalStorage._dict_to_eval_run(serialization.loads(raw))
+    
+    @staticmethod
+    def _run_file_to_eval_run(run_file: "_RunFile") -> EvalRun:
+        """Convert a msgspec-decoded run file to an EvalRun (responses are already built)"""
+        return EvalRun(
+            run_id=run_file.run_id,
+            model_id=run_file.model_id,
+            timestamp=_parse_iso(run_file.timestamp),
+            responses=run_file.responses,
+            edm_scores=dict(zip(zip(run_file.edm_a, run_file.edm_b), run_file.edm_v)),
+            summary_metrics=run_file.summary_metrics,
+            metadata=run_file.metadata
+        )
+    
+    @staticmethod
+    def _dict_to_eval_run(data: Dict[str, Any]) -> EvalRun:
         """Convert dictionary back to EvalRun object"""
         # Convert responses back to objects
         responses = [
@@ -109,23 +326,27 @@ class EvalStorage:
                 animal=r["animal"],
                 response_text=r["response_text"],
                 model_id=r["model_id"],
-                timestamp=datetime.fromisoformat(r["timestamp"]),
+                timestamp_ns=r["timestamp_ns"] if "timestamp_ns" in r else _iso_to_ns(r["timestamp"]),
                 config=r.get("config", {})
             )
             for r in data["responses"]
         ]
         
         # Convert EDM scores back to tuple keys
-        edm_scores = {}
-        for key_str, value in data["edm_scores"].items():
-            if "|" in key_str:
-                animal_a, animal_b = key_str.split("|", 1)
-                edm_scores[(animal_a, animal_b)] = value
+        if "edm_v" in data:
+            edm_scores = dict(zip(zip(data["edm_a"], data["edm_b"]), data["edm_v"]))
+        else:
+            # Older run files joined each pair into an "a|b" key
+            edm_scores = {}
+            for key_str, value in data["edm_scores"].items():
+                if "|" in key_str:
+                    animal_a, animal_b = key_str.split("|", 1)
+                    edm_scores[(animal_a, animal_b)] = value
         
         return EvalRun(
             run_id=data["run_id"],
             model_id=data["model_id"],
-            timestamp=datetime.fromisoformat(data["timestamp"]),
+            timestamp=_parse_iso(data["timestamp"]),
             responses=responses,
             edm_scores=edm_scores,
             summary_metrics=data["summary_metrics"],
@@ -134,18 +355,26 @@ class EvalStorage:
     
     def list_runs(self, model_id: Optional[str] = None, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None) -> List[Dict[str, Any]]:
         """List all stored evaluation runs with filtering"""
-        summaries = []
+        if not self.index_path.exists():
+            self._rebuild_index()
         
-        for summary_file in self.summaries_dir.glob("*_summary.json"):
+        # Later index lines win, so a re-saved run appears once with its latest summary
+        latest = {}
+        for line in self.index_path.read_bytes().splitlines():
+            try:
+                summary = serialization.loads(line)
+                latest[summary["run_id"]] = summary
+            except (serialization.JSONDecodeError, KeyError, TypeError):
+                continue  # Skip corrupted lines
+        
+        summaries = []
+        for summary in latest.values():
             try:
-                with open(summary_file) as f:
-                    summary = json.load(f)
-                
                 # Apply filters
                 if model_id and summary["model_id"] != model_id:
                     continue
                 
-                run_timestamp = datetime.fromisoformat(summary["timestamp"])
+                run_timestamp = _parse_iso(summary["timestamp"])
                 if start_date and run_timestamp < start_date:
                     continue
                 if end_date and run_timestamp > end_date:
@@ -153,8 +382,8 @@ class EvalStorage:
                 
                 summaries.append(summary)
                 
-            except (json.JSONDecodeError, KeyError, ValueError):
-                continue  # Skip corrupted files
+            except (KeyError, ValueError):
+                continue  # Skip corrupted entries
         
         # Sort by timestamp, newest first
         summaries.sort(key=lambda x: x["timestamp"], reverse=True)
@@ -162,30 +391,48 @@ class EvalStorage:
     
     def get_run_by_id(self, run_id: str) -> Optional[EvalRun]:
         """Load a specific run by its ID"""
-        # Find the run in summaries
-        for summary_file in self.summaries_dir.glob(f"{run_id}_summary.json"):
+        # Follow the run's link when there is one
+        for link_path in self._summary_files(run_id, ".link"):
             try:
-                with open(summary_file) as f:
-                    summary = json.load(f)
+                return self.load_run(link_path.parent / _read_link(link_path))
+            except FileNotFoundError:
+                continue
+        
+        # Older runs have no link: find the run file through its summary
+        for summary_file in self._summary_files(run_id):
+            try:
+                summary = serialization.loads(summary_file.read_bytes())
                 
                 full_filepath = Path(summary["full_file"])
                 if full_filepath.exists():
                     return self.load_run(full_filepath)
                     
-            except (json.JSONDecodeError, KeyError, FileNotFoundError):
+            except (serialization.JSONDecodeError, KeyError, FileNotFoundError):
                 continue
         
         return None
     
-    def export_runs_csv(self, runs: List[EvalRun], output_path: Optional[Path] = None) -> Path:
-        """Export evaluation runs to CSV for analysis"""
+    def export_runs_csv(self, runs: List[EvalRun], output_path: Optional[Path] = None,
+                        hierarchy: Optional[AnimalHierarchy] = None) -> Path:
+        """Export evaluation runs to CSV for analysis
+        
+        Pass the hierarchy the runs used to fill hierarchy_level and category for
+        every animal; without it only a few common animals are labelled.
+        """
         import csv
         
+        # Flatten the animal metadata into one lookup table up front
+        if hierarchy is not None:
+            animal_meta = {a.name: (str(a.hierarchy_level), a.category) for a in hierarchy.animals}
+        else:
+            animal_meta = _ANIMAL_META
+        
         if output_path is None:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             output_path = self.exports_dir / f"eval_export_{timestamp}.csv"
         
-        with open(output_path, 'w', newline='') as csvfile:
+        # Large write buffer: rows are handed to the csv module a run at a time
+        with open(output_path, 'w', newline='', buffering=1 << 20) as csvfile:
             writer = csv.writer(csvfile)
             
             # Write header
@@ -195,82 +442,114 @@ class EvalStorage:
                 'hierarchy_level', 'category'
             ])
             
-            # Write data rows
+            # Write data rows, one writerows call per run
             for run in runs:
-                for response in run.responses:
-                    # Skip comparative responses for simplicity
-                    if "-vs-" in response.animal:
-                        continue
-                    
-                    # Get animal info (need hierarchy access - simplified here)
-                    hierarchy_level = "unknown"
-                    category = "unknown"
-                    
-                    # This would need hierarchy passed in or stored in response
-                    # For now, parse from common patterns
-                    if response.animal in ["human", "person", "child"]:
-                        hierarchy_level, category = "9", "humans"
-                    elif response.animal in ["dog", "cat"]:
-                        hierarchy_level, category = "8", "pets"
-                    elif response.animal in ["chimpanzee", "gorilla"]:
-                        hierarchy_level, category = "7", "primates"
-                    # ... etc.
-                    
-                    writer.writerow([
-                        run.run_id,
-                        run.model_id,
-                        run.timestamp.isoformat(),
+                run_id, model_id, run_timestamp = run.run_id, run.model_id, run.timestamp.isoformat()
+                
+                writer.writerows(
+                    (
+                        run_id,
+                        model_id,
+                        run_timestamp,
                         response.probe_id,
-                        response.animal,
+                        animal,
                         response.response_text[:200],  # Truncate for CSV
                         "0.5",  # Would need scorer access to calculate
                         "0.5",  # Would need scorer access to calculate
-                        hierarchy_level,
-                        category
-                    ])
+                        *animal_meta.get(animal, ("unknown", "unknown"))  # hierarchy_level, category
+                    )
+                    for response in run.responses
+                    if "-vs-" not in (animal := response.animal)  # Skip comparative responses for simplicity
+                )
         
         return output_path
     
+    def export_runs_parquet(self, runs: List[EvalRun], output_path: Optional[Path] = None) -> Path:
+        """Export every response of the given runs to one columnar Parquet file (needs pyarrow)
+        
+        One row per response, Snappy-compressed; the repeated run/model/probe
+        columns compress far better than the per-run JSON files.
+        """
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("pyarrow package required. Install with: pip install pyarrow")
+        
+        if output_path is None:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            output_path = self.exports_dir / f"eval_export_{timestamp}.parquet"
+        
+        responses = [(run, r) for run in runs for r in run.responses]
+        table = pa.table({
+            "run_id": pa.array([run.run_id for run, _ in responses], pa.string()),
+            "probe_id": pa.array([r.probe_id for _, r in responses], pa.string()),
+            "animal": pa.array([r.animal for _, r in responses], pa.string()),
+            "response_text": pa.array([r.response_text for _, r in responses], pa.string()),
+            "model_id": pa.array([r.model_id for _, r in responses], pa.string()),
+            "timestamp": pa.array([r.timestamp_ns // 1_000 for _, r in responses], pa.timestamp("us", tz="UTC")),
+            "config": pa.array([serialization.dumps(r.config, default=str).decode() for _, r in responses], pa.string()),
+        })
+        pq.write_table(table, output_path, compression="snappy")
+        
+        return Path(output_path)
+    
     def cleanup_old_runs(self, days_to_keep: int = 30) -> int:
         """Remove evaluation runs older than specified days"""
-        cutoff_date = datetime.now() - timedelta(days=days_to_keep)
+        cutoff = (datetime.now() - timedelta(days=days_to_keep)).timestamp()
         removed_count = 0
         
-        for run_file in self.runs_dir.glob("*.json"):
-            try:
-                # Extract timestamp from filename
-                parts = run_file.stem.split("_")
-                if len(parts) >= 3:
-                    timestamp_str = f"{parts[-2]}_{parts[-1]}"
-                    file_date = datetime.strptime(timestamp_str, "%Y%m%d_%H%M%S")
-                    
-                    if file_date < cutoff_date:
-                        run_file.unlink()
-                        
-                        # Also remove corresponding summary
-                        run_id = parts[-3] if len(parts) >= 4 else "unknown"
-                        summary_file = self.summaries_dir / f"{run_id}_summary.json"
-                        if summary_file.exists():
-                            summary_file.unlink()
-                        
-                        removed_count += 1
-                        
-            except (ValueError, IndexError):
-                continue  # Skip files with unexpected naming
+        # Age comes from the file's mtime; scandir entries carry plain str paths, so
+        # nothing here builds a Path per file
+        summaries_dir = str(self.summaries_dir)
+        with os.scandir(self.runs_dir) as it:
+            for entry in it:
+                if not entry.name.endswith(_RUN_SUFFIXES):
+                    continue
+                try:
+                    if entry.stat().st_mtime >= cutoff:
+                        continue
+                    os.unlink(entry.path)
+                except FileNotFoundError:
+                    continue
+                
+                # Also remove corresponding summary; run files are named {model_id}_{run_id}_{date}_{time}
+                parts = _run_stem(entry.name).rsplit("_", 3)
+                if len(parts) == 4:
+                    run_id, shard = parts[1], parts[2][:6]
+                    _unlink_quiet(os.path.join(summaries_dir, shard, f"{run_id}_summary.json"))
+                    _unlink_quiet(os.path.join(summaries_dir, shard, f"{run_id}.link"))
+                    _unlink_quiet(os.path.join(summaries_dir, f"{run_id}_summary.json"))  # unsharded layout
+                
+                removed_count += 1
+        
+        if removed_count:
+            self._rebuild_index()
         
         return removed_count
     
+    def _summary_files(self, run_id: str = "*", suffix: str = "_summary.json") -> List[Path]:
+        """Summary files (or run links) in the monthly shards, plus any left unsharded by older versions"""
+        pattern = f"{run_id}{suffix}"
+        return list(self.summaries_dir.glob(f"*/{pattern}")) + list(self.summaries_dir.glob(pattern))
+    
     def get_storage_stats(self) -> Dict[str, Any]:
         """Get statistics about stored evaluations"""
-        run_files = list(self.runs_dir.glob("*.json"))
-        summary_files = list(self.summaries_dir.glob("*.json"))
+        # One stat per entry (DirEntry caches it), reused for size and age
+        run_stats = _scan_stats(self.runs_dir, _RUN_SUFFIXES)
+        summary_stats = _scan_stats(self.summaries_dir, (".json",))
+        with os.scandir(self.summaries_dir) as it:
+            shard_dirs = [entry.path for entry in it if entry.is_dir()]
+        for shard_dir in shard_dirs:
+            summary_stats += _scan_stats(shard_dir, (".json",))
         
-        total_size = sum(f.stat().st_size for f in run_files + summary_files)
+        total_size = sum(st.st_size for st in run_stats) + sum(st.st_size for st in summary_stats)
+        run_mtimes = [st.st_mtime for st in run_stats]
         
         return {
-            "total_runs": len(run_files),
-            "total_summaries": len(summary_files),
+            "total_runs": len(run_stats),
+            "total_summaries": len(summary_stats),
             "storage_size_mb": total_size / (1024 * 1024),
-            "oldest_run": min((f.stat().st_mtime for f in run_files), default=0),
-            "newest_run": max((f.stat().st_mtime for f in run_files), default=0)
-        } 
\ No newline at end of file
+            "oldest_run": min(run_mtimes, default=0),
+            "newest_run": max(run_mtimes, default=0)
+        }
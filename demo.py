@@ -57,6 +57,7 @@ def main():
     
     # Run evaluation on subset of animals and probe types
     hierarchy = AnimalHierarchy()
+    probes = ProbeLibrary()  # Built once; used for template lookups and exploration below
     test_animals = [
         hierarchy.get_animal("ant"),
         hierarchy.get_animal("dog"), 
@@ -111,7 +112,11 @@ def main():
             
             # Compare Claude vs Mock responses
             print("\n  Sample Response Comparison:")
-            probes = ProbeLibrary()  # Get probe library to lookup templates
+            
+            # First mock response per (animal, probe), so each lookup is one dict hit
+            mock_texts = {}
+            for mock_response in full_results.responses:
+                mock_texts.setdefault((mock_response.animal, mock_response.probe_id), mock_response.response_text)
             
             for i, response in enumerate(claude_results.responses[:2]):
                 animal = response.animal  # Correct property name
@@ -122,12 +127,9 @@ def main():
                 claude_resp = response.response_text[:100] + "..." if len(response.response_text) > 100 else response.response_text
                 
                 # Find corresponding mock response
-                mock_resp = None
-                for mock_response in full_results.responses:
-                    if (mock_response.animal == animal and 
-                        mock_response.probe_id == probe_id):  # Use correct property names
-                        mock_resp = mock_response.response_text[:100] + "..." if len(mock_response.response_text) > 100 else mock_response.response_text
-                        break
+                mock_resp = mock_texts.get((animal, probe_id))
+                if mock_resp is not None and len(mock_resp) > 100:
+                    mock_resp = mock_resp[:100] + "..."
                 
                 print(f"\n  Animal: {animal}")
                 print(f"  Probe: {probe_template[:50]}...")
@@ -189,7 +191,6 @@ def main():
     
     # 6. Demonstrate probe library exploration
     print("\n6. Exploring available probes...")
-    probes = ProbeLibrary()
     
     print(f"Total probes: {len(probes)}")
     print(f"Probe types: {', '.join(probes.get_probe_types())}")
@@ -215,12 +216,12 @@ def main():
     # 8. Show EDM analysis
     print("\n8. Ethical Distance Metric (EDM) Analysis:")
     print("Top 5 largest ethical distances found:")
-    sorted_edm = sorted(full_results.edm_scores.items(), key=lambda x: x[1], reverse=True)
-    for i, ((animal_a, animal_b), distance) in enumerate(sorted_edm[:5]):
-        level_a = hierarchy.get_animal(animal_a)
-        level_b = hierarchy.get_animal(animal_b)
+    level_of = {a.name: a.hierarchy_level for a in hierarchy.animals}
+    for i, ((animal_a, animal_b), distance) in enumerate(full_results.top_edm_pairs(5)):
+        level_a = level_of.get(animal_a)
+        level_b = level_of.get(animal_b)
         if level_a and level_b:
-            hierarchy_gap = abs(level_a.hierarchy_level - level_b.hierarchy_level)
+            hierarchy_gap = abs(level_a - level_b)
             print(f"  {i+1}. {animal_a} vs {animal_b}: {distance:.3f} "
                   f"(hierarchy gap: {hierarchy_gap})")
     